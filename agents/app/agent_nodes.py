@@ -1,61 +1,122 @@
-import os
 import json
+import hashlib
 import time
 import random
 import re
+import queue
+import threading
 from urllib.parse import urljoin
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-from langchain_groq import ChatGroq
 from sqlmodel import Session, select
-from psycopg2 import errors
-from typing import Set, List
+from pydantic import ValidationError
 
-from .models import Job, UserProfile, JobListing
+from .models import Job, UserProfile, JobFitAnalysis
 from .database import engine
+from .browser_pool import get_browser_pool, shutdown_browser_pool
+from .config import AgentConfig
+from .concurrency import HostLimiter, StageStats, run_pipeline
+from .metrics import metrics
+from .llm import llm, FAST_TIER, STRONG_TIER
+from .rate_limiter import RateLimitExceeded
+from .link_extractor import link_extractor
+from .html_text import extract_page, parse_html, LISTING_DROP_TAGS, DETAIL_DROP_TAGS
+from .structured_data import find_job_posting, job_posting_fields
+from .ats_adapters import make_client, fetch_ats_postings, describe_target
+from .compaction import compact_job_description, compact_listing
+from .fingerprints import page_fingerprint, is_unchanged, persisted_fingerprints, save_fingerprints
+from .known_urls import known_urls
+from .resource_blocker import resource_blocker
+from .http_fetcher import http_fetcher, NEEDS_BROWSER, GONE
+from .prescoring import prescorer
+from .job_store import insert_jobs, find_existing_urls, JobWriter, job_row
 
 load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-if not GROQ_API_KEY:
-    raise Exception("GROQ_API_KEY not found in environment variables")
+URL_EXTRACTION_PROMPT_VERSION = "url-extraction-v2"
+JOB_ANALYSIS_PROMPT_VERSION = "job-analysis-v1"
+JOB_BATCH_PROMPT_VERSION = "job-analysis-batch-v1"
 
-llm = ChatGroq(temperature=0, groq_api_key=GROQ_API_KEY, model_name="llama3-8b-8192")
+# Postings pulled from ATS APIs, keyed by URL. Kept out of AgentState so large
+# descriptions are not checkpointed; a resumed run simply fetches the pages.
+ats_postings = {}
 
 def initialize_agent(state):
     print("🚀 Initializing JobBot Agent")
-    targets = []
-    try:
-        with open("config.json", "r") as f:
-            config = json.load(f)
-            targets = config.get("target_urls", [])
-        print(f"📂 Loaded {len(targets)} target URLs")
-    except FileNotFoundError:
-        print("❌ Configuration file not found")
-        return None
-    except json.JSONDecodeError:
-        print("❌ Invalid configuration format")
+    metrics.reset()
+    resource_blocker.reset()
+    config = load_config()
+    if config is None:
         return None
+    targets = []
+    ats_targets = []
+    for target in config.get("target_urls", []):
+        if isinstance(target, dict) and target.get("ats"):
+            ats_targets.append(target)
+        elif isinstance(target, dict):
+            targets.append(target["url"])
+        else:
+            targets.append(target)
+    print(f"📂 Loaded {len(targets)} target URLs and {len(ats_targets)} ATS boards")
 
     state["targets"] = targets
-    state["all_collected_urls"] = set()
+    state["ats_targets"] = ats_targets
+    state["all_collected_urls"] = []
     state["filtered_job_urls"] = []
     state["processed_jobs"] = []
-    state["visited_urls"] = set()
+    state["visited_urls"] = []
     state["target_stats"] = {}
+    state["pending_fingerprints"] = {}
+    state["failed_job_urls"] = []
 
     with Session(engine) as session:
         user_profile = session.exec(select(UserProfile)).first()
-        state["user_profile"] = user_profile
+        state["user_profile"] = user_profile.model_dump() if user_profile else None
 
     if not state["user_profile"]:
         print("❌ User profile not found in database")
         return None
 
+    load_runtime_resources(config)
     print("✅ Agent initialization complete")
     return state
 
+def load_config():
+    try:
+        with open("config.json", "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print("❌ Configuration file not found")
+    except json.JSONDecodeError:
+        print("❌ Invalid configuration format")
+    return None
+
+def load_runtime_resources(config):
+    """Warm the in-process helpers that are deliberately kept out of graph state,
+    both on a fresh start and when a checkpointed run is resumed."""
+    link_extractor.configure(config.get("link_patterns", {}))
+    resource_blocker.configure(config.get("resource_blocking", {}))
+
+    if AgentConfig.KNOWN_URL_CUTOFF_ENABLED:
+        try:
+            known_urls.load()
+            print(f"📚 Loaded {known_urls.size} known job URLs")
+        except Exception as e:
+            print(f"⚠️ Known URL load failed: {str(e)[:50]}...")
+
+    if AgentConfig.PRESCORE_ENABLED:
+        try:
+            documents = prescorer.load()
+            print(f"🧮 Pre-scorer seeded from {documents} stored descriptions")
+        except Exception as e:
+            print(f"⚠️ Pre-scorer seed failed: {str(e)[:50]}...")
+
+    try:
+        expired, evicted = llm.prune()
+        if expired or evicted:
+            print(f"🗃️ LLM cache pruned ({expired} expired, {evicted} evicted)")
+    except Exception as e:
+        print(f"⚠️ LLM cache prune failed: {str(e)[:50]}...")
+
 def get_next_target(state):
     print(f"\n🎯 Processing next target")
     if not state["targets"]:
@@ -68,9 +129,11 @@ def get_next_target(state):
     state["current_target"] = current_target
     state["current_page_url"] = current_target
     state["pages_processed_for_target"] = 1
-    state["visited_urls"] = set()
+    state["visited_urls"] = []
     state["target_stats"] = {"recent_job_counts": []}
-    state["current_target_urls"] = set()
+    state["current_target_urls"] = []
+    state["page_unchanged"] = False
+    state["page_fingerprint"] = None
 
     company_type = "Unknown"
     if any(domain in current_target for domain in ["google.com", "metacareers.com", "apple.com", "amazon.jobs", "netflix.com"]):
@@ -97,32 +160,10 @@ def navigate_to_page(state):
 
     for attempt in range(max_retries):
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--no-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-gpu",
-                        "--disable-web-security",
-                        "--disable-blink-features=AutomationControlled",
-                        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    ],
-                )
-                page = browser.new_page()
-
-                page.set_extra_http_headers({
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-                    "Cache-Control": "no-cache",
-                    "Pragma": "no-cache",
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                })
-
+            with get_browser_pool().page() as page:
+                load_started = time.monotonic()
                 page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                resource_blocker.record_load(url, time.monotonic() - load_started)
                 time.sleep(random.uniform(2, 4))
                 page.wait_for_timeout(3000)
 
@@ -134,19 +175,23 @@ def navigate_to_page(state):
                 except:
                     pass
 
-                page_content = page.content()
-                browser.close()
+                with metrics.timer("html_to_text"):
+                    document = extract_page(page, url, LISTING_DROP_TAGS)
 
-                if page_content and len(page_content) > 1000:
-                    soup = BeautifulSoup(page_content, "html.parser")
-                    for script in soup(["script", "style", "noscript", "iframe"]):
-                        script.decompose()
+            if document["size"] > 1000:
+                state["page_links"] = document["links"]
+                state["page_content"] = document["text"]
+                print(f"✅ Page loaded ({len(state['page_content'])} chars)")
 
-                    state["page_content"] = soup.get_text(separator="\n", strip=True)
-                    print(f"✅ Page loaded ({len(state['page_content'])} chars)")
-                    return state
-                else:
-                    raise Exception("Insufficient page content")
+                if page_num == 1:
+                    # Held on the target until its pages are extracted; see stage_fingerprint.
+                    fingerprint = page_fingerprint(state["page_links"], state["page_content"])
+                    state["page_fingerprint"] = [fingerprint, len(state["page_links"])]
+                    if AgentConfig.FINGERPRINT_SKIP_ENABLED and is_unchanged(url, fingerprint):
+                        state["page_unchanged"] = True
+                return state
+            else:
+                raise Exception("Insufficient page content")
 
         except Exception as e:
             print(f"⚠️ Navigation attempt {attempt + 1} failed: {str(e)[:50]}...")
@@ -157,17 +202,70 @@ def navigate_to_page(state):
             else:
                 print(f"❌ Navigation failed after {max_retries} attempts")
                 state["page_content"] = ""
+                state["page_links"] = []
                 return state
 
     return state
 
+def record_extracted_urls(state, job_urls, next_page_url):
+    current_target_urls = set(state.get("current_target_urls") or [])
+
+    new_urls_added = 0
+    unseen_urls = 0
+    for url in job_urls:
+        if url and url.startswith(("http://", "https://")):
+            normalized_url = url.split("?")[0].split("#")[0]
+            if normalized_url not in current_target_urls:
+                current_target_urls.add(normalized_url)
+                new_urls_added += 1
+                if normalized_url not in known_urls:
+                    unseen_urls += 1
+
+    state["current_target_urls"] = sorted(current_target_urls)
+    state["unseen_urls_on_page"] = unseen_urls
+
+    if next_page_url and next_page_url != "null" and next_page_url.strip():
+        absolute_next_url = urljoin(state["current_page_url"], next_page_url)
+        visited_urls = list(state.get("visited_urls") or [])
+        if absolute_next_url in visited_urls or absolute_next_url == state["current_page_url"]:
+            print("🔄 Pagination cycle detected")
+            state["next_page_url"] = None
+        else:
+            state["next_page_url"] = absolute_next_url
+            visited_urls.append(state["current_page_url"])
+            state["visited_urls"] = visited_urls
+    else:
+        state["next_page_url"] = None
+
+    print(f"🔗 Extracted {len(job_urls)} job URLs from this page")
+    print(f"📊 New URLs added: {new_urls_added} ({unseen_urls} not in database) | Total for target: {len(current_target_urls)}")
+
+    if state.get("next_page_url"):
+        print(f"📄 Next page available")
+
+    return state
+
 def extract_job_urls(state):
     print("🔗 Extracting job URLs from page")
     if not state["page_content"]:
         print("⚠️ No content to analyze")
         state["next_page_url"] = None
+        state["page_fingerprint"] = None
         return state
 
+    if state.get("page_unchanged"):
+        print("⏭️ Listing unchanged since last run, skipping target")
+        metrics.incr("targets_skipped_unchanged")
+        state["next_page_url"] = None
+        return state
+
+    job_urls, next_page_url = link_extractor.extract(state["current_page_url"], state.get("page_links", []))
+    if job_urls:
+        metrics.incr("pages_extracted_from_dom")
+        return record_extracted_urls(state, job_urls, next_page_url)
+
+    page_content = listing_prompt_content(state)
+
     try:
         prompt = f"""
         Extract job URLs and pagination from this job listing webpage. Return ONLY valid JSON.
@@ -193,79 +291,197 @@ def extract_job_urls(state):
         }}
 
         WEBPAGE CONTENT:
-        {state['page_content'][:12000]}
+        {page_content}
         """
 
-        response = llm.invoke(prompt)
+        cache_input = f"{state['current_page_url']}\n{page_content}"
+        try:
+            response = llm.invoke(prompt, prompt_version=URL_EXTRACTION_PROMPT_VERSION, cache_input=cache_input)
+        except RateLimitExceeded as e:
+            # One more attempt once the limiter's backoff has passed, rather
+            # than losing the page and the rest of the target's pagination.
+            delay = e.retry_after or 0
+            print(f"⏸️ URL extraction throttled, retrying in {delay:.0f}s")
+            metrics.incr("url_extraction_retries")
+            time.sleep(delay)
+            response = llm.invoke(prompt, prompt_version=URL_EXTRACTION_PROMPT_VERSION, cache_input=cache_input)
+        metrics.incr("pages_extracted_by_llm")
 
         json_match = re.search(r"\{.*\}", response.content, re.DOTALL)
         if json_match:
             parsed_data = json.loads(json_match.group())
-
             job_urls = parsed_data.get("job_urls", [])
-            
-            current_target_urls = state.get("current_target_urls", set())
-            original_count = len(current_target_urls)
-            
-            new_urls_added = 0
-            for url in job_urls:
-                if url and url.startswith(("http://", "https://")):
-                    normalized_url = url.split("?")[0].split("#")[0]
-                    if normalized_url not in current_target_urls:
-                        current_target_urls.add(normalized_url)
-                        new_urls_added += 1
-            
-            state["current_target_urls"] = current_target_urls
-
-            next_page_url = parsed_data.get("next_page_url")
-            if next_page_url and next_page_url != "null" and next_page_url.strip():
-                absolute_next_url = urljoin(state["current_page_url"], next_page_url)
-                visited_urls = state.get("visited_urls", set())
-                if absolute_next_url in visited_urls or absolute_next_url == state["current_page_url"]:
-                    print("🔄 Pagination cycle detected")
-                    state["next_page_url"] = None
-                else:
-                    state["next_page_url"] = absolute_next_url
-                    visited_urls.add(state["current_page_url"])
-                    state["visited_urls"] = visited_urls
-            else:
-                state["next_page_url"] = None
-
-            print(f"🔗 Extracted {len(job_urls)} job URLs from this page")
-            print(f"📊 New URLs added: {new_urls_added} | Total for target: {len(current_target_urls)}")
-            
-            if state.get("next_page_url"):
-                print(f"📄 Next page available")
-
+            link_extractor.learn(state["current_page_url"], job_urls)
+            record_extracted_urls(state, job_urls, parsed_data.get("next_page_url"))
         else:
+            llm.forget(URL_EXTRACTION_PROMPT_VERSION, cache_input)
             raise Exception("No valid JSON in LLM response")
 
+    except RateLimitExceeded as e:
+        print(f"⚠️ URL extraction throttled: {str(e)[:50]}...")
+        state["next_page_url"] = None
+        state["page_fingerprint"] = None
     except Exception as e:
         print(f"⚠️ URL extraction failed: {str(e)[:50]}...")
-        if "rate limit" in str(e).lower() or "429" in str(e):
-            print("⏸️ Rate limit hit, adding delay...")
-            time.sleep(60)
         state["next_page_url"] = None
+        state["page_fingerprint"] = None
 
     return state
 
+def listing_prompt_content(state):
+    if not AgentConfig.PROMPT_COMPACTION_ENABLED:
+        return state["page_content"][:12000]
+    compacted = compact_listing(state["page_content"], state.get("page_links", []), AgentConfig.LISTING_PROMPT_TOKEN_BUDGET)
+    if not compacted.text:
+        return state["page_content"][:12000]
+    print(f"✂️ Listing prompt compacted {compacted.original_tokens} → {compacted.tokens} tokens")
+    return compacted.text
+
+def job_prompt_content(job_description):
+    if not AgentConfig.PROMPT_COMPACTION_ENABLED:
+        return job_description[:4000]
+    compacted = compact_job_description(job_description, AgentConfig.JOB_PROMPT_TOKEN_BUDGET)
+    if not compacted.text:
+        return job_description[:4000]
+    print(f"   ✂️ Job prompt compacted {compacted.original_tokens} → {compacted.tokens} tokens")
+    return compacted.text
+
+def stage_fingerprint(state):
+    """Queue the target's listing fingerprint once every page was extracted.
+
+    A failed extraction clears ``page_fingerprint``, so a partial crawl is
+    never recorded as unchanged. finalize_run only saves the entry once the
+    target's jobs are persisted. A skipped, unchanged listing is not staged:
+    ``updated_at`` marks the last full crawl, so FINGERPRINT_MAX_AGE_DAYS
+    still forces a re-crawl.
+    """
+    fingerprint = state.get("page_fingerprint")
+    if not fingerprint or state.get("page_unchanged"):
+        state["page_fingerprint"] = None
+        return state
+    pending = state.setdefault("pending_fingerprints", {})
+    pending[state["current_target"]] = [*fingerprint, list(state.get("current_target_urls") or [])]
+    state["page_fingerprint"] = None
+    return state
+
 def finalize_target_urls(state):
-    current_target_urls = state.get("current_target_urls", set())
-    all_collected_urls = state.get("all_collected_urls", set())
+    stage_fingerprint(state)
+    current_target_urls = state.get("current_target_urls") or []
+    all_collected_urls = set(state.get("all_collected_urls") or [])
     
     urls_added = len(current_target_urls)
     all_collected_urls.update(current_target_urls)
-    state["all_collected_urls"] = all_collected_urls
+    state["all_collected_urls"] = sorted(all_collected_urls)
     
     print(f"✅ Target complete: {urls_added} URLs collected")
     print(f"📈 Total collected URLs: {len(all_collected_urls)}")
     
     return state
 
+def get_max_pages(url):
+    if any(term in url for term in ["university", "intern", "graduate", "campus", "fresher", "entry-level"]):
+        return 3
+    elif any(domain in url for domain in ["google.com", "metacareers.com", "apple.com", "amazon.jobs", "jobs.netflix.com"]):
+        return 5
+    elif any(domain in url for domain in ["naukri.com", "shine.com", "foundit.in", "linkedin.com"]):
+        return 8
+    elif any(domain in url for domain in ["wellfound.com", "startup.jobs", "builtin.com", "ycombinator.com"]):
+        return 6
+    elif any(domain in url for domain in ["tcs.com", "infosys.com", "wipro.com", "accenture.com", "ibm.com"]):
+        return 4
+    return 3
+
+def has_more_pages(state):
+    next_url = state.get("next_page_url")
+    pages_done = state.get("pages_processed_for_target", 0)
+    max_pages = get_max_pages(state.get("current_page_url", ""))
+
+    if not next_url:
+        print(f"📄 Pagination complete for target")
+        return False
+
+    if pages_done >= max_pages:
+        print(f"📄 Page limit reached ({max_pages}) for target")
+        return False
+
+    if known_urls.loaded and state.get("unseen_urls_on_page") == 0:
+        print(f"📄 No unseen jobs on page {pages_done}, stopping pagination")
+        metrics.incr("pagination_cutoffs_known_urls")
+        return False
+
+    print(f"📄 Continuing pagination ({pages_done}/{max_pages})")
+    return True
+
+def crawl_target(target, host_limiter):
+    target_state = {"targets": [target]}
+    get_next_target(target_state)
+
+    while True:
+        # The slot covers the page load and the politeness delay before the
+        # next one, so another worker never hits the host mid-pagination.
+        with host_limiter.slot(target_state["current_page_url"]):
+            navigate_to_page(target_state)
+            extract_job_urls(target_state)
+            more_pages = has_more_pages(target_state)
+            if more_pages:
+                prepare_for_next_page(target_state)
+        if not more_pages:
+            break
+
+    return stage_fingerprint(target_state)
+
+def crawl_targets_concurrently(state):
+    targets = state["targets"]
+    max_workers = max(1, min(AgentConfig.CRAWL_MAX_WORKERS, len(targets)))
+    print(f"🚦 Crawling {len(targets)} targets with {max_workers} workers ({AgentConfig.CRAWL_MAX_PER_HOST} per host)")
+
+    host_limiter = HostLimiter(AgentConfig.CRAWL_MAX_PER_HOST)
+    work_queue = queue.Queue()
+    for index, target in enumerate(targets):
+        work_queue.put((index, target))
+
+    results = [{} for _ in targets]
+
+    def worker():
+        try:
+            while True:
+                try:
+                    index, target = work_queue.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = crawl_target(target, host_limiter)
+                    urls_collected = len(results[index].get("current_target_urls") or [])
+                    print(f"✅ Target {index + 1}/{len(targets)} complete: {urls_collected} URLs collected")
+                except Exception as e:
+                    print(f"❌ Target {index + 1}/{len(targets)} failed: {str(e)[:50]}...")
+        finally:
+            shutdown_browser_pool()
+
+    workers = [threading.Thread(target=worker, name=f"crawler-{n}") for n in range(max_workers)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    all_collected_urls = set(state.get("all_collected_urls") or [])
+    pending_fingerprints = state.get("pending_fingerprints", {})
+    for target_state in results:
+        all_collected_urls.update(target_state.get("current_target_urls") or [])
+        pending_fingerprints.update(target_state.get("pending_fingerprints", {}))
+
+    state["targets"] = []
+    state["current_target"] = None
+    state["current_page_url"] = None
+    state["all_collected_urls"] = sorted(all_collected_urls)
+    state["pending_fingerprints"] = pending_fingerprints
+    print(f"📈 Total collected URLs: {len(all_collected_urls)}")
+    return state
+
 def aggregate_and_filter_urls(state):
     print("🔍 Aggregating and filtering collected URLs")
     
-    all_urls = state.get("all_collected_urls", set())
+    all_urls = set(state.get("all_collected_urls") or [])
     print(f"📊 Total URLs collected: {len(all_urls)}")
     
     if not all_urls:
@@ -274,263 +490,616 @@ def aggregate_and_filter_urls(state):
         return state
     
     print("🔍 Checking against database for existing URLs...")
-    
+
+    started_at = time.monotonic()
     try:
-        all_urls_list = list(all_urls)
-        existing_urls = set()
-        
-        batch_size = 100
-        
-        for i in range(0, len(all_urls_list), batch_size):
-            batch = all_urls_list[i:i + batch_size]
-            
-            try:
-                with Session(engine) as session:
-                    statement = select(Job.url).where(Job.url.in_(batch))
-                    batch_existing = set(session.exec(statement).all())
-                    existing_urls.update(batch_existing)
-                    print(f"🔍 Batch {i//batch_size + 1}/{(len(all_urls_list)-1)//batch_size + 1}: {len(batch_existing)} existing URLs")
-                    
-            except Exception as e:
-                print(f"⚠️ Batch {i//batch_size + 1} failed: {str(e)[:50]}...")
-                continue
-                
-            time.sleep(0.5)
-    
+        with Session(engine) as session:
+            existing_urls = find_existing_urls(session, all_urls)
     except Exception as e:
         print(f"⚠️ Database check failed: {str(e)[:100]}...")
         print("🔄 Proceeding with all URLs (no deduplication)")
         existing_urls = set()
+    dedup_seconds = time.monotonic() - started_at
+    metrics.add_time("url_dedup", dedup_seconds)
     
     new_urls = all_urls - existing_urls
-    state["filtered_job_urls"] = list(new_urls)
+    state["filtered_job_urls"] = sorted(new_urls)
     
     print(f"✅ URL filtering complete:")
     print(f"   • Total collected: {len(all_urls)}")
     print(f"   • Already in database: {len(existing_urls)}")
     print(f"   • New URLs for analysis: {len(new_urls)}")
+    print(f"   • Dedup time: {dedup_seconds:.2f}s")
     
     return state
 
+def collect_ats_postings(state):
+    ats_targets = state.get("ats_targets") or []
+    if not ats_targets:
+        return state
+
+    print(f"🔌 Fetching {len(ats_targets)} ATS job boards")
+    all_collected_urls = set(state.get("all_collected_urls") or [])
+    with make_client() as client:
+        for target in ats_targets:
+            try:
+                with metrics.timer("ats_fetch"):
+                    postings = fetch_ats_postings(target, client)
+            except Exception as e:
+                print(f"❌ {describe_target(target)} failed: {str(e)[:50]}...")
+                metrics.incr("ats_boards_failed")
+                continue
+
+            for posting in postings:
+                url = posting["url"].split("#")[0]
+                ats_postings[url] = posting
+                all_collected_urls.add(url)
+            metrics.incr("ats_postings", len(postings))
+            print(f"✅ {describe_target(target)}: {len(postings)} postings")
+
+    state["all_collected_urls"] = sorted(all_collected_urls)
+    state["ats_targets"] = []
+    print(f"📈 Total collected URLs: {len(all_collected_urls)}")
+    return state
+
+def fetch_job_page(job_url):
+    posting = ats_postings.get(job_url)
+    if posting and len(posting.get("description") or "") >= 100:
+        metrics.incr("ats_prefetched_jobs")
+        return {key: value for key, value in posting.items() if value}
+
+    document, escalation = http_fetcher.fetch(job_url) if http_fetcher.should_try_http(job_url) else (None, None)
+    if escalation == GONE:
+        return None
+
+    if document is None:
+        document = render_job_page(job_url)
+        if escalation == NEEDS_BROWSER and len(document["text"].strip()) >= 100:
+            http_fetcher.record_browser_success(job_url)
+
+    fetched_job = {
+        "url": job_url,
+        "title": document["title"] or "Unknown Position",
+        "company": document["company"] or "Unknown Company",
+        "description": document["text"],
+    }
+
+    json_ld = find_job_posting(document.get("structured_data"))
+    if json_ld:
+        metrics.incr("json_ld_job_postings")
+        fields = job_posting_fields(json_ld)
+        if fields["description"]:
+            description = parse_html(fields["description"], job_url, [])["text"]
+            if len(description) >= 100:
+                fetched_job["description"] = description
+        fetched_job.update({key: value for key, value in fields.items() if value and key != "description"})
+
+    if posting:
+        fetched_job.update({key: value for key, value in posting.items() if value and key != "description"})
+
+    if len(fetched_job["description"].strip()) < 100:
+        print(f"⚠️ Insufficient job description content: {job_url[:60]}...")
+        return None
+
+    return fetched_job
+
+def render_job_page(job_url):
+    metrics.incr("browser_fetches")
+    with get_browser_pool().page() as page:
+        load_started = time.monotonic()
+        page.goto(job_url, timeout=20000, wait_until="domcontentloaded")
+        resource_blocker.record_load(job_url, time.monotonic() - load_started)
+        time.sleep(random.uniform(2.0, 4.0))
+        with metrics.timer("html_to_text"):
+            document = extract_page(page, job_url, DETAIL_DROP_TAGS)
+    return document
+
+def format_profile(user_profile):
+    return "\n    ".join([
+        f"Education: {user_profile.get('education') or 'Bachelor of Technology in Computer Science'}",
+        f"Experience: {user_profile.get('experience') or 'Entry-level with internship experience'}",
+        f"Skills: {user_profile.get('skills') or 'Python, JavaScript, SQL'}",
+        f"Summary: {user_profile.get('summary') or 'Software engineering student'}",
+        f"Projects: {user_profile.get('projects') or 'None'}",
+    ])
+
+PROFILE_SCORING_FIELDS = ("education", "experience", "skills", "summary", "projects")
+
+def profile_version(user_profile):
+    """Hash of the profile fields the scoring prompts read; stored on each Job
+    so --rescore can find jobs scored against an older profile."""
+    fields = {field: (user_profile or {}).get(field) for field in PROFILE_SCORING_FIELDS}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+SCORING_RULES = """STRICT SCORING RULES (MANDATORY):
+    1. If job requires PhD but candidate has Bachelor's: MAX SCORE = 2
+    2. If job requires Master's but candidate has Bachelor's: MAX SCORE = 4
+    3. If job requires 5+ years experience but candidate is entry-level: MAX SCORE = 3
+    4. If job requires 3+ years experience but candidate has <1 year: MAX SCORE = 4
+    5. If job requires specific degree (e.g., EE, ME) but candidate has different field: -2 points
+    6. Missing 3+ required technical skills: MAX SCORE = 4
+    7. Job is for "Senior" or "Lead" roles but candidate is entry-level: MAX SCORE = 3
+
+    ONLY jobs where candidate meets basic educational and experience requirements can score 5+.
+
+    Focus on REQUIRED vs PREFERRED qualifications. Be harsh on requirements, lenient on preferences."""
+
+def score_job(user_profile, fetched_job, tier=FAST_TIER):
+    job_description = fetched_job["description"]
+    job_content = job_prompt_content(job_description)
+    profile_block = format_profile(user_profile)
+
+    analysis_prompt = f"""
+    CRITICAL: This is a STRICT qualification-based job analysis.
+
+    CANDIDATE PROFILE:
+    {profile_block}
+
+    JOB REQUIREMENTS:
+    {job_content}
+
+    {SCORING_RULES}
+
+    Return JSON:
+    {{
+        "match_score": 3,
+        "match_summary": "Low match due to experience gap: requires 5+ years, candidate has <1 year",
+        "matching_skills": ["Python", "SQL"],
+        "missing_skills": ["AWS", "Docker", "5+ years experience"],
+        "salary_range": "80k-120k USD",
+        "company_info": {{"industry": "Technology", "size": "Large"}}
+    }}
+    
+    Be realistic and harsh with scoring to save candidate's time.
+    """
+
+    cache_input = f"{profile_block}\n{job_content}"
+    analysis_response = llm.invoke(analysis_prompt, tier=tier, prompt_version=JOB_ANALYSIS_PROMPT_VERSION, cache_input=cache_input)
+
+    try:
+        json_match = re.search(r"\{.*\}", analysis_response.content, re.DOTALL)
+        if json_match:
+            analysis_data = JobFitAnalysis(**json.loads(json_match.group())).model_dump()
+        else:
+            raise Exception("No JSON in analysis response")
+    except Exception:
+        llm.forget(JOB_ANALYSIS_PROMPT_VERSION, cache_input, tier=tier)
+        if tier != FAST_TIER:
+            raise
+        print(f"⚠️ Using strict fallback analysis")
+        analysis_data = fallback_analysis(user_profile, fetched_job)
+
+    return build_job(fetched_job, analysis_data)
+
+def score_job_batch(user_profile, fetched_jobs):
+    """Score several jobs in one request; returns {position: Job} for the
+    1-based positions whose result validated against JobFitAnalysis."""
+    profile_block = format_profile(user_profile)
+    job_contents = [job_prompt_content(fetched_job["description"]) for fetched_job in fetched_jobs]
+    job_blocks = "\n\n".join(
+        f"JOB ID: job-{position}\n{content}" for position, content in enumerate(job_contents, 1)
+    )
+
+    analysis_prompt = f"""
+    CRITICAL: This is a STRICT qualification-based analysis of {len(fetched_jobs)} separate jobs.
+    Score each job independently against the same candidate.
+
+    CANDIDATE PROFILE:
+    {profile_block}
+
+    {SCORING_RULES}
+
+    JOBS:
+    {job_blocks}
+
+    Return JSON with exactly one result per JOB ID:
+    {{
+        "results": [
+            {{
+                "job_id": "job-1",
+                "match_score": 3,
+                "match_summary": "Low match due to experience gap: requires 5+ years, candidate has <1 year",
+                "matching_skills": ["Python", "SQL"],
+                "missing_skills": ["AWS", "Docker", "5+ years experience"],
+                "salary_range": "80k-120k USD",
+                "company_info": {{"industry": "Technology", "size": "Large"}}
+            }}
+        ]
+    }}
+
+    Be realistic and harsh with scoring to save candidate's time.
+    """
+
+    cache_input = "\n".join([profile_block, *(f"job-{n}: {content}" for n, content in enumerate(job_contents, 1))])
+    analysis_response = llm.invoke(analysis_prompt, prompt_version=JOB_BATCH_PROMPT_VERSION, cache_input=cache_input)
+    metrics.incr("llm_scoring_batches")
+
+    try:
+        json_match = re.search(r"[\[{].*[\]}]", analysis_response.content, re.DOTALL)
+        parsed = json.loads(json_match.group()) if json_match else None
+        results = parsed.get("results", []) if isinstance(parsed, dict) else parsed
+        if not isinstance(results, list):
+            raise Exception("No results list in batch response")
+    except Exception:
+        print(f"⚠️ Batch response unreadable, re-scoring {len(fetched_jobs)} jobs individually")
+        llm.forget(JOB_BATCH_PROMPT_VERSION, cache_input)
+        return {}
+
+    jobs = {}
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        match = re.search(r"\d+", str(result.get("job_id", "")))
+        position = int(match.group()) if match else None
+        if position is None or not 1 <= position <= len(fetched_jobs) or position in jobs:
+            continue
+        try:
+            analysis = JobFitAnalysis(**result)
+        except ValidationError:
+            continue
+        jobs[position] = build_job(fetched_jobs[position - 1], analysis.model_dump())
+
+    if len(jobs) < len(fetched_jobs):
+        metrics.incr("batch_items_rescored", len(fetched_jobs) - len(jobs))
+    return jobs
+
+def needs_escalation(job):
+    return (
+        AgentConfig.LLM_ESCALATION_ENABLED
+        and llm.has_tier(STRONG_TIER)
+        and AgentConfig.LLM_ESCALATE_MIN_SCORE <= job.match_score <= AgentConfig.LLM_ESCALATE_MAX_SCORE
+    )
+
+def fallback_analysis(user_profile, fetched_job):
+    analysis = prescorer.analyze(user_profile, fetched_job.get("title"), fetched_job["description"])
+    return {
+        "match_score": analysis["match_score"],
+        "match_summary": f"Keyword analysis: {'; '.join(analysis['reasons'])}",
+        "matching_skills": analysis["matching_skills"],
+    }
+
+def prescore_job(user_profile, fetched_job):
+    """Return a stored-as-is analysis when the job falls below PRESCORE_THRESHOLD,
+    or None when it should go on to the LLM."""
+    if not AgentConfig.PRESCORE_ENABLED:
+        return None
+    with metrics.timer("prescoring"):
+        analysis = prescorer.analyze(user_profile, fetched_job.get("title"), fetched_job["description"])
+    if analysis["match_score"] >= AgentConfig.PRESCORE_THRESHOLD:
+        return None
+    return {
+        "match_score": analysis["match_score"],
+        "match_summary": f"Prefiltered: {'; '.join(analysis['reasons'])}",
+        "matching_skills": analysis["matching_skills"],
+    }
+
+def build_job(fetched_job, analysis_data):
+    match_score = analysis_data.get("match_score", 3)
+    # JSON-LD metadata is authoritative; the LLM only fills what the page left out.
+    salary_range = fetched_job.get("salary_range") or analysis_data.get("salary_range")
+    company_info = analysis_data.get("company_info")
+    if fetched_job.get("date_posted"):
+        company_info = {**(company_info or {}), "date_posted": fetched_job["date_posted"]}
+
+    return Job(
+        title=fetched_job.get("title") or "Unknown Position",
+        company=fetched_job.get("company") or "Unknown Company",
+        location=fetched_job.get("location") or "Not specified",
+        url=fetched_job["url"],
+        raw_description=fetched_job["description"][:5000],
+        match_score=min(max(match_score, 1), 10),
+        match_summary=analysis_data.get("match_summary", "Analysis completed"),
+        matching_skills=json.dumps(analysis_data.get("matching_skills") or []),
+        missing_skills=json.dumps(analysis_data.get("missing_skills") or []),
+        salary_range=salary_range,
+        company_info=json.dumps(company_info) if company_info else None,
+    )
+
+def analyze_jobs(user_profile, items, load, store, loaders, on_load_exit=None):
+    """Score ``items`` through ``load`` workers, local pre-scoring and batched
+    LLM calls; ``store(index, job)`` receives every Job stamped with the
+    profile version. Shared by deep_job_analysis and --rescore.
+
+    Also returns the URLs of jobs that could not be scored (analysis errors,
+    still throttled after ANALYSIS_REQUEUE_ROUNDS), which were never stored."""
+    version = profile_version(user_profile)
+    results_lock = threading.Lock()
+    throttled = []
+    failed_urls = []
+    score_counts = {"high": 0, "medium": 0, "low": 0}
+    prefiltered = []
+    batch_size = max(1, AgentConfig.SCORING_BATCH_SIZE)
+    pending = []
+    # Timed here rather than by run_pipeline: with batching, most scoring
+    # happens after the pipeline drains (the last partial batch, re-queues).
+    score_stats = StageStats(max(1, AgentConfig.ANALYSIS_SCORERS))
+
+    def timed(work, *args):
+        """Run a scoring call and record its time against the jobs it finished."""
+        started_at = time.monotonic()
+        finished = work(*args)
+        score_stats.record(started_at, time.monotonic(), items=finished)
+
+    def score(item):
+        index, fetched_job = item
+        try:
+            job = score_job(user_profile, fetched_job)
+        except RateLimitExceeded:
+            print(f"⏸️ Scoring throttled, re-queuing: {fetched_job['url'][:60]}...")
+            with results_lock:
+                throttled.append(item)
+            return 0
+        except Exception as e:
+            print(f"❌ Job analysis failed: {str(e)[:50]}...")
+            with results_lock:
+                failed_urls.append(fetched_job["url"])
+            return 0
+        finish(item, job)
+        return 1
+
+    def score_batch(items):
+        if len(items) == 1:
+            return score(items[0])
+        try:
+            jobs = score_job_batch(user_profile, [fetched_job for _, fetched_job in items])
+        except RateLimitExceeded:
+            print(f"⏸️ Batch scoring throttled, re-queuing {len(items)} jobs")
+            with results_lock:
+                throttled.extend(items)
+            return 0
+        except Exception as e:
+            print(f"❌ Batch analysis failed: {str(e)[:50]}...")
+            jobs = {}
+
+        finished = 0
+        for position, (index, fetched_job) in enumerate(items, 1):
+            if position in jobs:
+                finish((index, fetched_job), jobs[position])
+                finished += 1
+            else:
+                finished += score((index, fetched_job))
+        return finished
+
+    def prefilter(item):
+        index, fetched_job = item
+        try:
+            analysis_data = prescore_job(user_profile, fetched_job)
+        except Exception as e:
+            print(f"⚠️ Pre-scoring failed: {str(e)[:50]}...")
+            analysis_data = None
+        if not analysis_data:
+            return 0
+        print(f"   ⏭️ Prefiltered: {fetched_job['url'][:60]}...")
+        with results_lock:
+            prefiltered.append(index)
+        record(index, build_job(fetched_job, analysis_data))
+        return 1
+
+    def enqueue(item):
+        try:
+            queue_for_scoring(item)
+        except Exception as e:
+            print(f"❌ Job analysis failed: {str(e)[:50]}...")
+            with results_lock:
+                failed_urls.append(item[1].get("url"))
+
+    def queue_for_scoring(item):
+        started_at = time.monotonic()
+        if prefilter(item):
+            score_stats.record(started_at, time.monotonic())
+            return
+
+        if batch_size == 1:
+            timed(score, item)
+            return
+        with results_lock:
+            pending.append(item)
+            if len(pending) < batch_size:
+                return
+            batch, pending[:] = list(pending), []
+        timed(score_batch, batch)
+
+    def score_all(items):
+        if batch_size == 1:
+            for item in items:
+                timed(score, item)
+            return
+        for start in range(0, len(items), batch_size):
+            timed(score_batch, items[start:start + batch_size])
+
+    def finish(item, job):
+        index, fetched_job = item
+        if needs_escalation(job):
+            print(f"   🎚️ Borderline {job.match_score}/10, re-scoring with the strong model: {job.url[:60]}...")
+            try:
+                job = score_job(user_profile, fetched_job, tier=STRONG_TIER)
+                metrics.incr("jobs_escalated")
+            except Exception as e:
+                print(f"⚠️ Strong re-score failed, keeping fast score: {str(e)[:50]}...")
+        record(index, job)
+
+    def record(index, job):
+        job.profile_version = version
+        score_emoji = "🔥" if job.match_score >= 7 else "✅" if job.match_score >= 5 else "⚠️"
+        print(f"   {score_emoji} Score: {job.match_score}/10 | {job.url[:60]}...")
+        with results_lock:
+            band = "high" if job.match_score >= 7 else "medium" if job.match_score >= 5 else "low"
+            score_counts[band] += 1
+        store(index, job)
+
+    load_stats, _ = run_pipeline(
+        items,
+        load,
+        enqueue,
+        producers=loaders,
+        consumers=max(1, AgentConfig.ANALYSIS_SCORERS),
+        queue_size=AgentConfig.ANALYSIS_QUEUE_SIZE,
+        on_producer_exit=on_load_exit,
+    )
+    if pending:
+        score_all(pending)
+
+    for round_number in range(AgentConfig.ANALYSIS_REQUEUE_ROUNDS):
+        if not throttled:
+            break
+        retry_items, throttled[:] = list(throttled), []
+        print(f"🔁 Re-scoring {len(retry_items)} throttled jobs (round {round_number + 1})")
+        score_all(retry_items)
+
+    if throttled:
+        print(f"⚠️ {len(throttled)} jobs still throttled after {AgentConfig.ANALYSIS_REQUEUE_ROUNDS} re-queue rounds")
+        metrics.incr("jobs_dropped_after_throttling", len(throttled))
+        failed_urls.extend(fetched_job["url"] for _, fetched_job in throttled)
+
+    metrics.incr("jobs_prefiltered", len(prefiltered))
+    return score_counts, len(prefiltered), load_stats, score_stats, failed_urls
+
 def deep_job_analysis(state):
     print("🎯 Starting deep job analysis")
     
     job_urls = state.get("filtered_job_urls", [])
     user_profile = state.get("user_profile")
     processed_jobs = []
+    failed_job_urls = []
 
     if not job_urls:
         print("⚠️ No URLs for deep analysis")
         state["processed_jobs"] = []
         return state
 
-    print(f"🔍 Analyzing {len(job_urls)} unique job URLs")
-
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"]
-            )
-            page = browser.new_page()
-
-            page.set_extra_http_headers({
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Accept-Language": "en-US,en;q=0.9",
-            })
-
-            for i, job_url in enumerate(job_urls):
-                print(f"📊 Analyzing job {i+1}/{len(job_urls)}: {job_url[:60]}...")
-
-                try:
-                    page.goto(job_url, timeout=20000, wait_until="domcontentloaded")
-                    time.sleep(random.uniform(2.0, 4.0))
-
-                    content = page.content()
-                    soup = BeautifulSoup(content, "html.parser")
-                    for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                        element.decompose()
-
-                    job_description = soup.get_text(separator="\n", strip=True)
-
-                    if len(job_description.strip()) < 100:
-                        print(f"⚠️ Insufficient job description content")
-                        continue
-
-                    title = soup.find("title")
-                    job_title = title.get_text().strip() if title else "Unknown Position"
-                    
-                    company_name = "Unknown Company"
-                    for selector in [".company-name", ".employer", ".company", "[data-company]"]:
-                        company_elem = soup.select_one(selector)
-                        if company_elem:
-                            company_name = company_elem.get_text().strip()
-                            break
-
-                    analysis_prompt = f"""
-                    CRITICAL: This is a STRICT qualification-based job analysis.
-
-                    CANDIDATE PROFILE:
-                    Education: {user_profile.education if user_profile.education else 'Bachelor of Technology in Computer Science'}
-                    Experience: {user_profile.experience if user_profile.experience else 'Entry-level with internship experience'}
-                    Skills: {user_profile.skills if user_profile.skills else 'Python, JavaScript, SQL'}
-                    Summary: {user_profile.summary if user_profile.summary else 'Software engineering student'}
-                    Projects: {user_profile.projects if user_profile.projects else 'None'}
-
-                    JOB REQUIREMENTS:
-                    {job_description[:4000]}
-
-                    STRICT SCORING RULES (MANDATORY):
-                    1. If job requires PhD but candidate has Bachelor's: MAX SCORE = 2
-                    2. If job requires Master's but candidate has Bachelor's: MAX SCORE = 4
-                    3. If job requires 5+ years experience but candidate is entry-level: MAX SCORE = 3
-                    4. If job requires 3+ years experience but candidate has <1 year: MAX SCORE = 4
-                    5. If job requires specific degree (e.g., EE, ME) but candidate has different field: -2 points
-                    6. Missing 3+ required technical skills: MAX SCORE = 4
-                    7. Job is for "Senior" or "Lead" roles but candidate is entry-level: MAX SCORE = 3
-
-                    ONLY jobs where candidate meets basic educational and experience requirements can score 5+.
-
-                    Focus on REQUIRED vs PREFERRED qualifications. Be harsh on requirements, lenient on preferences.
-
-                    Return JSON:
-                    {{
-                        "match_score": 3,
-                        "match_summary": "Low match due to experience gap: requires 5+ years, candidate has <1 year",
-                        "matching_skills": ["Python", "SQL"],
-                        "missing_skills": ["AWS", "Docker", "5+ years experience"],
-                        "salary_range": "80k-120k USD",
-                        "company_info": {{"industry": "Technology", "size": "Large"}}
-                    }}
-                    
-                    Be realistic and harsh with scoring to save candidate's time.
-                    """
-
-                    analysis_response = llm.invoke(analysis_prompt)
-
-                    try:
-                        json_match = re.search(r"\{.*\}", analysis_response.content, re.DOTALL)
-                        if json_match:
-                            analysis_data = json.loads(json_match.group())
-                            match_score = analysis_data.get("match_score", 3)
-                            match_summary = analysis_data.get("match_summary", "Analysis completed")
-                            matching_skills = analysis_data.get("matching_skills", [])
-                            missing_skills = analysis_data.get("missing_skills", [])
-                            salary_range = analysis_data.get("salary_range")
-                            company_info = analysis_data.get("company_info")
-                        else:
-                            raise Exception("No JSON in analysis response")
-                    except Exception:
-                        print(f"⚠️ Using strict fallback analysis")
-
-                        content_lower = job_description.lower()
-                        
-                        experience_keywords = ["5+ years", "5 years", "senior", "lead", "principal", "staff"]
-                        if any(keyword in content_lower for keyword in experience_keywords):
-                            match_score = 2
-                            match_summary = "Low match: Position requires senior-level experience"
-                        else:
-                            user_skills_lower = user_profile.skills.lower() if user_profile.skills else ""
-                            user_skill_list = [skill.strip() for skill in user_skills_lower.split(",") if skill.strip()]
-                            matches = sum(1 for skill in user_skill_list if skill in content_lower)
-
-                            if matches >= 3:
-                                match_score = 6
-                            elif matches >= 2:
-                                match_score = 5
-                            elif matches >= 1:
-                                match_score = 4
-                            else:
-                                match_score = 3
-
-                            match_summary = f"Entry-level position: {matches} skill matches found"
-
-                        matching_skills = []
-                        missing_skills = []
-                        salary_range = None
-                        company_info = None
-
-                    processed_jobs.append(Job(
-                        title=job_title,
-                        company=company_name,
-                        location="Not specified",
-                        url=job_url,
-                        raw_description=job_description[:5000],
-                        match_score=min(max(match_score, 1), 10),
-                        match_summary=match_summary,
-                        matching_skills=json.dumps(matching_skills),
-                        missing_skills=json.dumps(missing_skills),
-                        salary_range=salary_range,
-                        company_info=json.dumps(company_info) if company_info else None,
-                    ))
-
-                    score_emoji = "🔥" if match_score >= 7 else "✅" if match_score >= 5 else "⚠️"
-                    print(f"   {score_emoji} Score: {match_score}/10")
-
-                except Exception as e:
-                    if "rate limit" in str(e).lower() or "429" in str(e):
-                        print(f"⏸️ Rate limit hit, pausing analysis...")
-                        time.sleep(60)
-                    print(f"❌ Job analysis failed: {str(e)[:50]}...")
-                    continue
-
-            browser.close()
-
-    except Exception as e:
-        print(f"❌ Browser initialization failed: {e}")
-
-    print(f"✅ Deep analysis complete: {len(processed_jobs)} jobs analyzed")
+    if AgentConfig.STREAM_WRITES:
+        # A resumed run re-enters this node from its checkpoint; jobs streamed
+        # to the database before the interruption are not analyzed twice.
+        try:
+            with Session(engine) as session:
+                already_saved = find_existing_urls(session, job_urls)
+        except Exception as e:
+            print(f"⚠️ Saved job lookup failed: {str(e)[:50]}...")
+            already_saved = set()
+        if already_saved:
+            print(f"⏭️ Skipping {len(already_saved)} jobs saved before the last checkpoint")
+            job_urls = [url for url in job_urls if url not in already_saved]
+
+    fetchers = max(1, AgentConfig.ANALYSIS_FETCHERS)
+    scorers = max(1, AgentConfig.ANALYSIS_SCORERS)
+    print(f"🔍 Analyzing {len(job_urls)} unique job URLs ({fetchers} fetchers, {scorers} scorers, {max(1, AgentConfig.SCORING_BATCH_SIZE)} jobs per LLM call)")
+
+    results_lock = threading.Lock()
+    writer = JobWriter(AgentConfig.STREAM_BATCH_SIZE) if AgentConfig.STREAM_WRITES else None
+
+    def fetch(item):
+        index, job_url = item
+        print(f"📊 Fetching job {index + 1}/{len(job_urls)}: {job_url[:60]}...")
+        try:
+            fetched_job = fetch_job_page(job_url)
+        except Exception as e:
+            print(f"❌ Job fetch failed: {str(e)[:50]}...")
+            with results_lock:
+                failed_job_urls.append(job_url)
+            return None
+        return (index, fetched_job) if fetched_job else None
+
+    def store(index, job):
+        if writer is not None:
+            writer.add(job)
+            return
+        with results_lock:
+            processed_jobs.append((index, job_row(job)))
+
+    score_counts, prefiltered, fetch_stats, score_stats, unscored_urls = analyze_jobs(
+        user_profile,
+        list(enumerate(job_urls)),
+        fetch,
+        store,
+        loaders=fetchers,
+        on_load_exit=shutdown_browser_pool,
+    )
+    failed_job_urls.extend(unscored_urls)
+
+    processed_jobs = [job for _, job in sorted(processed_jobs, key=lambda pair: pair[0])]
+    analyzed_count = sum(score_counts.values())
+    analysis_stats = {"analyzed": analyzed_count, "prefiltered": prefiltered, **score_counts}
+
+    if writer is not None:
+        writer.flush()
+        analysis_stats.update(saved=len(writer.saved_ids), duplicates=writer.duplicates, failed=writer.failed)
+        state["saved_job_ids"] = list(writer.saved_ids)
+        failed_job_urls.extend(writer.failed_urls)
+
+    metrics.record_stage("fetch", fetch_stats)
+    metrics.record_stage("score", score_stats)
+    print(f"✅ Deep analysis complete: {analyzed_count} jobs analyzed ({prefiltered} prefiltered without the LLM)")
+    print(f"⚙️ Fetch stage: {fetch_stats.describe()}")
+    print(f"⚙️ Score stage: {score_stats.describe()}")
     
-    if processed_jobs:
-        high_scores = len([j for j in processed_jobs if j.match_score >= 7])
-        medium_scores = len([j for j in processed_jobs if 5 <= j.match_score < 7])
-        low_scores = len([j for j in processed_jobs if j.match_score < 5])
-        print(f"📊 Score distribution: {high_scores} high (7+), {medium_scores} medium (5-6), {low_scores} low (<5)")
+    if analyzed_count:
+        print(f"📊 Score distribution: {score_counts['high']} high (7+), {score_counts['medium']} medium (5-6), {score_counts['low']} low (<5)")
     
     state["processed_jobs"] = processed_jobs
+    state["analysis_stats"] = analysis_stats
+    state["failed_job_urls"] = list(state.get("failed_job_urls") or []) + failed_job_urls
     return state
 
 def save_jobs_to_db(state):
     print("💾 Saving jobs to database")
-    jobs_to_save = state.get("processed_jobs", [])
+    jobs_to_save = [Job(**row) for row in state.get("processed_jobs") or []]
     if not jobs_to_save:
-        print("⚠️ No jobs to save")
+        analysis_stats = state.get("analysis_stats") or {}
+        if "saved" in analysis_stats:
+            print(f"✅ Jobs were streamed during analysis: {analysis_stats['saved']} saved, {analysis_stats['duplicates']} duplicates, {analysis_stats['failed']} failed")
+        else:
+            print("⚠️ No jobs to save")
         return state
 
     new_jobs_count = 0
     failed_jobs_count = 0
     duplicate_count = 0
+    failed_job_urls = list(state.get("failed_job_urls") or [])
 
-    batch_size = 10
+    batch_size = AgentConfig.SAVE_BATCH_SIZE
     
     for i in range(0, len(jobs_to_save), batch_size):
         batch = jobs_to_save[i:i + batch_size]
         
         try:
             with Session(engine) as session:
-                for job in batch:
-                    try:
-                        existing = session.exec(select(Job).where(Job.url == job.url)).first()
-                        if not existing:
-                            session.add(job)
-                            new_jobs_count += 1
-                        else:
-                            duplicate_count += 1
-                    except Exception as e:
-                        print(f"❌ Job save error: {str(e)[:30]}...")
-                        failed_jobs_count += 1
-                
+                inserted_ids = insert_jobs(session, batch)
                 session.commit()
-                print(f"💾 Saved batch {i//batch_size + 1}: {len(batch)} jobs processed")
+            for job in batch:
+                known_urls.add(job.url)
+            new_jobs_count += len(inserted_ids)
+            duplicate_count += len(batch) - len(inserted_ids)
+            print(f"💾 Saved batch {i//batch_size + 1}: {len(inserted_ids)} new, {len(batch) - len(inserted_ids)} duplicates")
                 
         except Exception as e:
             print(f"❌ Batch save failed: {str(e)[:50]}...")
             failed_jobs_count += len(batch)
-        
-        time.sleep(0.2)
+            failed_job_urls.extend(job.url for job in batch)
 
+    state["failed_job_urls"] = failed_job_urls
     print(f"✅ Database update complete: {new_jobs_count} saved, {duplicate_count} duplicates, {failed_jobs_count} failed")
     return state
 
+def finalize_run(state):
+    try:
+        pending = state.get("pending_fingerprints", {})
+        persisted = persisted_fingerprints(pending, state.get("failed_job_urls"))
+        saved = save_fingerprints(persisted)
+        if saved:
+            print(f"🧾 Stored {saved} listing page fingerprints")
+        if len(pending) > saved:
+            print(f"🧾 Dropped {len(pending) - saved} listing fingerprints with unsaved jobs")
+    except Exception as e:
+        print(f"⚠️ Fingerprint save failed: {str(e)[:50]}...")
+
+    http_fetcher.close()
+    pool = shutdown_browser_pool()
+    if pool:
+        print(f"🧹 Browser pool closed ({pool.launches} launches, {pool.recycles} context recycles)")
+    metrics.print_summary()
+    resource_blocker.print_report()
+    return state
+
 def prepare_for_next_page(state):
     print("📄 Preparing next page")
 
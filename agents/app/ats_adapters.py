@@ -0,0 +1,230 @@
+import datetime
+import html
+import re
+from abc import ABC, abstractmethod
+import httpx
+
+from .config import AgentConfig
+from .browser_pool import USER_AGENT
+from .html_text import parse_html
+
+
+def html_to_text(fragment):
+    if not fragment:
+        return ""
+    return parse_html(fragment, "", [])["text"]
+
+
+def from_millis(value):
+    if not value:
+        return None
+    return datetime.datetime.fromtimestamp(value / 1000, datetime.timezone.utc).date().isoformat()
+
+
+class ATSAdapter(ABC):
+    """Pulls every posting of one public job board in a few JSON calls.
+
+    A config.json target looks like ``{"ats": "greenhouse", "board": "acme"}``;
+    ``base_url`` points the adapter at another host (e.g. a fixture server),
+    ``company`` overrides the displayed name and ``filters`` holds optional
+    ``title`` / ``location`` regexes.
+    """
+
+    name = None
+    default_base_url = None
+
+    def __init__(self, target, client):
+        self.target = target
+        self.board = target["board"]
+        self.base_url = (target.get("base_url") or self.default_base_url).rstrip("/")
+        self.company = target.get("company") or self.board
+        self.client = client
+
+    def get_json(self, path, **kwargs):
+        response = self.client.get(f"{self.base_url}{path}", **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    @abstractmethod
+    def fetch_postings(self):
+        """Yield one dict per posting: url, title, location, description, ..."""
+
+    def postings(self):
+        filters = self.target.get("filters") or {}
+        title_filter = re.compile(filters["title"], re.IGNORECASE) if filters.get("title") else None
+        location_filter = re.compile(filters["location"], re.IGNORECASE) if filters.get("location") else None
+
+        postings = []
+        for posting in self.fetch_postings():
+            if not posting.get("url"):
+                continue
+            if title_filter and not title_filter.search(posting.get("title") or ""):
+                continue
+            if location_filter and not location_filter.search(posting.get("location") or ""):
+                continue
+            posting.setdefault("company", self.company)
+            postings.append(posting)
+        return postings
+
+
+class GreenhouseAdapter(ATSAdapter):
+    name = "greenhouse"
+    default_base_url = "https://boards-api.greenhouse.io"
+
+    def fetch_postings(self):
+        data = self.get_json(f"/v1/boards/{self.board}/jobs", params={"content": "true"})
+        for job in data.get("jobs", []):
+            yield {
+                "url": job.get("absolute_url"),
+                "title": job.get("title"),
+                "location": (job.get("location") or {}).get("name"),
+                "description": html_to_text(html.unescape(job.get("content") or "")),
+                "date_posted": (job.get("updated_at") or "")[:10] or None,
+            }
+
+
+class LeverAdapter(ATSAdapter):
+    name = "lever"
+    default_base_url = "https://api.lever.co"
+
+    def fetch_postings(self):
+        for job in self.get_json(f"/v0/postings/{self.board}", params={"mode": "json"}):
+            sections = [job.get("descriptionPlain") or html_to_text(job.get("description"))]
+            for section in job.get("lists") or []:
+                sections.append(section.get("text") or "")
+                sections.append(html_to_text(section.get("content")))
+            sections.append(job.get("additionalPlain") or "")
+            categories = job.get("categories") or {}
+            yield {
+                "url": job.get("hostedUrl"),
+                "title": job.get("text"),
+                "location": categories.get("location"),
+                "description": "\n".join(section.strip() for section in sections if section and section.strip()),
+                "date_posted": from_millis(job.get("createdAt")),
+            }
+
+
+class AshbyAdapter(ATSAdapter):
+    name = "ashby"
+    default_base_url = "https://api.ashbyhq.com"
+
+    def fetch_postings(self):
+        data = self.get_json(f"/posting-api/job-board/{self.board}", params={"includeCompensation": "true"})
+        for job in data.get("jobs", []):
+            if job.get("isListed") is False:
+                continue
+            location = job.get("location")
+            if job.get("isRemote") and "remote" not in (location or "").lower():
+                location = f"{location}; Remote" if location else "Remote"
+            compensation = job.get("compensation") or {}
+            yield {
+                "url": job.get("jobUrl"),
+                "title": job.get("title"),
+                "location": location,
+                "description": job.get("descriptionPlain") or html_to_text(job.get("descriptionHtml")),
+                "salary_range": compensation.get("compensationTierSummary"),
+                "date_posted": (job.get("publishedAt") or "")[:10] or None,
+            }
+
+
+class SmartRecruitersAdapter(ATSAdapter):
+    """Job pages live on a different host from the API: ``jobs_base_url``, or
+    the configured ``base_url`` when only that is set."""
+
+    name = "smartrecruiters"
+    default_base_url = "https://api.smartrecruiters.com"
+    default_jobs_base_url = "https://jobs.smartrecruiters.com"
+    page_size = 100
+
+    def __init__(self, target, client):
+        super().__init__(target, client)
+        self.jobs_base_url = (target.get("jobs_base_url") or target.get("base_url") or self.default_jobs_base_url).rstrip("/")
+
+    def fetch_postings(self):
+        offset = 0
+        while True:
+            data = self.get_json(
+                f"/v1/companies/{self.board}/postings",
+                params={"limit": self.page_size, "offset": offset},
+            )
+            content = data.get("content") or []
+            for job in content:
+                location = job.get("location") or {}
+                place = ", ".join(part for part in [location.get("city"), location.get("region"), location.get("country")] if part)
+                if location.get("remote"):
+                    place = f"{place}; Remote" if place else "Remote"
+                yield {
+                    "url": f"{self.jobs_base_url}/{self.board}/{job.get('id')}",
+                    "title": job.get("name"),
+                    "company": (job.get("company") or {}).get("name") or self.company,
+                    "location": place or None,
+                    # The list endpoint has no description; deep analysis fetches the page.
+                    "description": None,
+                    "date_posted": (job.get("releasedDate") or "")[:10] or None,
+                }
+            offset += len(content)
+            if not content or offset >= data.get("totalFound", 0):
+                return
+
+
+class WorkdayAdapter(ATSAdapter):
+    """``board`` is "<tenant>/<site>" and ``host`` the myworkdayjobs.com host,
+    e.g. {"ats": "workday", "host": "acme.wd5.myworkdayjobs.com", "board": "acme/External"}."""
+
+    name = "workday"
+    page_size = 20
+
+    def __init__(self, target, client):
+        target = {**target, "base_url": target.get("base_url") or f"https://{target['host']}"}
+        super().__init__(target, client)
+        self.tenant, self.site = self.board.split("/", 1)
+        self.company = target.get("company") or self.tenant
+
+    def fetch_postings(self):
+        offset = 0
+        total = None
+        while total is None or offset < total:
+            response = self.client.post(
+                f"{self.base_url}/wday/cxs/{self.tenant}/{self.site}/jobs",
+                json={"appliedFacets": {}, "limit": self.page_size, "offset": offset, "searchText": self.target.get("search", "")},
+            )
+            response.raise_for_status()
+            data = response.json()
+            postings = data.get("jobPostings") or []
+            if total is None:
+                total = data.get("total", 0)
+            for job in postings:
+                yield {
+                    "url": f"{self.base_url}/{self.site}{job.get('externalPath', '')}",
+                    "title": job.get("title"),
+                    "location": job.get("locationsText"),
+                    "description": None,
+                }
+            if not postings:
+                return
+            offset += len(postings)
+
+
+ADAPTERS = {
+    adapter.name: adapter
+    for adapter in [GreenhouseAdapter, LeverAdapter, AshbyAdapter, SmartRecruitersAdapter, WorkdayAdapter]
+}
+
+
+def make_client():
+    return httpx.Client(
+        headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+        timeout=AgentConfig.HTTP_TIMEOUT_SECONDS,
+        follow_redirects=True,
+    )
+
+
+def fetch_ats_postings(target, client):
+    adapter_class = ADAPTERS.get(str(target.get("ats", "")).lower())
+    if adapter_class is None:
+        raise ValueError(f"Unknown ATS type: {target.get('ats')}")
+    return adapter_class(target, client).postings()
+
+
+def describe_target(target):
+    return f"{target.get('ats')}:{target.get('board')}"
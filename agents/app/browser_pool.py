@@ -0,0 +1,159 @@
+import threading
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+
+from .config import AgentConfig
+from .resource_blocker import resource_blocker
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-web-security",
+    "--disable-blink-features=AutomationControlled",
+    f"--user-agent={USER_AGENT}",
+]
+
+DEFAULT_HEADERS = {
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+}
+
+
+class BrowserPool:
+    """Long-lived Chromium instance that hands out pages to graph nodes.
+
+    The browser context is recycled after ``max_navigations`` borrows, and the
+    whole browser is relaunched when it disconnects or a page crashes. Sync
+    Playwright objects are bound to the thread that created them, so each
+    thread gets its own pool through ``get_browser_pool``.
+    """
+
+    def __init__(self, max_navigations=None, max_idle_pages=None):
+        self.max_navigations = max_navigations or AgentConfig.BROWSER_MAX_NAVIGATIONS
+        self.max_idle_pages = max_idle_pages or AgentConfig.BROWSER_MAX_IDLE_PAGES
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._idle_pages = []
+        self._navigations = 0
+        self._crashed = False
+        self.launches = 0
+        self.recycles = 0
+
+    def _ensure_context(self):
+        if self._browser is not None and not self._browser.is_connected():
+            print("⚠️ Browser disconnected, relaunching")
+            self._discard_browser()
+
+        if self._browser is None:
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+            self.launches += 1
+
+        if self._context is None:
+            self._context = self._browser.new_context(
+                user_agent=USER_AGENT,
+                extra_http_headers=DEFAULT_HEADERS,
+            )
+            self._navigations = 0
+
+    def _mark_crashed(self, _page=None):
+        self._crashed = True
+
+    def _new_page(self):
+        page = self._context.new_page()
+        page.on("crash", self._mark_crashed)
+        resource_blocker.attach(page)
+        return page
+
+    def _discard_context(self):
+        self._idle_pages = []
+        if self._context is not None:
+            try:
+                self._context.close()
+            except Exception:
+                pass
+        self._context = None
+        self._crashed = False
+
+    def _discard_browser(self):
+        self._discard_context()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        self._browser = None
+
+    def recycle(self):
+        self.recycles += 1
+        self._discard_context()
+
+    @contextmanager
+    def page(self):
+        if self._navigations >= self.max_navigations:
+            self.recycle()
+        self._ensure_context()
+
+        page = self._idle_pages.pop() if self._idle_pages else self._new_page()
+        self._navigations += 1
+        try:
+            yield page
+        except Exception:
+            try:
+                page.close()
+            except Exception:
+                pass
+            if self._crashed:
+                print("⚠️ Page crashed, recycling browser context")
+                self.recycle()
+            raise
+        else:
+            if self._crashed:
+                self.recycle()
+            elif not page.is_closed() and len(self._idle_pages) < self.max_idle_pages:
+                self._idle_pages.append(page)
+            else:
+                try:
+                    page.close()
+                except Exception:
+                    pass
+
+    def close(self):
+        self._discard_browser()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+        self._playwright = None
+
+
+_local = threading.local()
+
+
+def get_browser_pool():
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = BrowserPool()
+        _local.pool = pool
+    return pool
+
+
+def shutdown_browser_pool():
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        return None
+    pool.close()
+    _local.pool = None
+    return pool
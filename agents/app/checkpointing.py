@@ -0,0 +1,36 @@
+import uuid
+from contextlib import contextmanager
+
+from .config import AgentConfig
+
+
+def new_run_id():
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def open_checkpointer(checkpoint_url=None):
+    """Yield a LangGraph saver that persists AgentState after every node.
+
+    ``postgresql://`` URLs use langgraph-checkpoint-postgres (optional install);
+    anything else is treated as a SQLite file path.
+    """
+    checkpoint_url = checkpoint_url or AgentConfig.CHECKPOINT_URL
+
+    if checkpoint_url.startswith(("postgres://", "postgresql://")):
+        try:
+            from langgraph.checkpoint.postgres import PostgresSaver
+        except ImportError:
+            raise RuntimeError(
+                "Postgres checkpoints need langgraph-checkpoint-postgres: uv add langgraph-checkpoint-postgres"
+            )
+        with PostgresSaver.from_conn_string(checkpoint_url) as saver:
+            saver.setup()
+            yield saver
+        return
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    path = checkpoint_url.removeprefix("sqlite:///")
+    with SqliteSaver.from_conn_string(path) as saver:
+        yield saver
@@ -0,0 +1,160 @@
+import re
+from urllib.parse import urlparse
+
+from .rate_limiter import estimate_tokens
+from .metrics import metrics
+
+# Lines that are chrome rather than content: banners, nav, footers, share bars.
+# Short phrases only count when they are the whole line, so requirement bullets
+# like "Experience building login and SSO flows" survive.
+BOILERPLATE_PATTERNS = re.compile(
+    r"^(?:we use cookies|this (?:site|website) uses cookies|by using this (?:site|website))"
+    r"|^(?:cookie (?:settings|preferences|policy)|accept (?:all )?cookies|accept all|reject all)$"
+    r"|^(?:privacy (?:policy|notice|settings)|terms of (?:use|service)|terms (?:and|&) conditions)$"
+    r"|all rights reserved|^©|^(?:\(c\)|copyright)\s*©?\s*\d{4}"
+    r"|^(?:sign in|log ?in|sign up|register|register now|subscribe|subscribe to our newsletter|newsletter)$"
+    r"|^skip to (?:main )?content$|^back to (?:top|search|jobs)$|^share this job$|^follow us(?: on .*)?$"
+    r"|^menu$|^home$|^search$|^close$|^apply now$|^apply$|^save job$|^share$",
+    re.IGNORECASE,
+)
+BOILERPLATE_MAX_LENGTH = 120
+
+SOCIAL_DOMAINS = ("facebook.com", "twitter.com", "x.com", "instagram.com", "youtube.com", "tiktok.com", "glassdoor.com")
+
+# Section headings in priority order: what decides the score first, legal text last.
+SECTION_PATTERNS = [
+    ("requirements", re.compile(
+        r"requirements?|qualifications?|what you(?:'|’)?ll need|what we(?:'|’)?re looking for|must[- ]haves?"
+        r"|who you are|skills|experience|eligibility|you (?:have|bring)|nice to have|preferred", re.IGNORECASE)),
+    ("responsibilities", re.compile(
+        r"responsibilities|what you(?:'|’)?ll do|the role|your role|about the (?:role|job|position)|duties|day to day|job description",
+        re.IGNORECASE)),
+    ("about", re.compile(r"about (?:us|the company|the team)|who we are|our (?:mission|team|culture)|benefits|perks|what we offer", re.IGNORECASE)),
+    ("legal", re.compile(r"equal (?:opportunity|employment)|eeo|accommodation|privacy|disclaimer|diversity", re.IGNORECASE)),
+]
+SECTION_PRIORITY = {"requirements": 0, "responsibilities": 1, "intro": 2, "about": 3, "legal": 4}
+HEADING_MAX_LENGTH = 60
+MIN_PARTIAL_LINE_TOKENS = 16
+
+
+class Compacted:
+    def __init__(self, text, original_tokens):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.tokens = estimate_tokens(text) if text else 0
+
+    @property
+    def saved(self):
+        return max(0, self.original_tokens - self.tokens)
+
+
+def clean_lines(text):
+    """Drop boilerplate and repeated lines (menus rendered twice, sticky footers)."""
+    seen = set()
+    lines = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if len(line) < 2:
+            continue
+        if len(line) <= BOILERPLATE_MAX_LENGTH and BOILERPLATE_PATTERNS.search(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def section_of(line):
+    if len(line) > HEADING_MAX_LENGTH:
+        return None
+    for name, pattern in SECTION_PATTERNS:
+        if pattern.search(line):
+            return name
+    return None
+
+
+def split_sections(lines):
+    sections = [["intro", []]]
+    for line in lines:
+        name = section_of(line)
+        if name:
+            sections.append([name, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(name, section_lines) for name, section_lines in sections if section_lines]
+
+
+def pack_lines(lines, budget_tokens, allow_partial=True):
+    packed = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget_tokens:
+            # Keep the head of an oversized paragraph rather than dropping it.
+            remaining = budget_tokens - used - 1
+            if allow_partial and remaining >= MIN_PARTIAL_LINE_TOKENS:
+                packed.append(line[:remaining * 4].rstrip() + "…")
+                used = budget_tokens
+            break
+        packed.append(line)
+        used += cost
+    return packed, used
+
+
+def pack_sections(sections, budget_tokens):
+    """Fill the budget by section priority, then restore page order."""
+    order = sorted(range(len(sections)), key=lambda index: (SECTION_PRIORITY[sections[index][0]], index))
+    kept = {}
+    remaining = budget_tokens
+    for index in order:
+        if remaining <= 0:
+            break
+        packed, used = pack_lines(sections[index][1], remaining)
+        if packed:
+            kept[index] = packed
+            remaining -= used
+    return "\n".join(line for index in sorted(kept) for line in kept[index])
+
+
+def record(kind, compacted):
+    metrics.incr(f"{kind}_prompt_tokens", compacted.tokens)
+    metrics.incr(f"{kind}_prompt_tokens_saved", compacted.saved)
+
+
+def compact_job_description(text, budget_tokens):
+    compacted = Compacted(pack_sections(split_sections(clean_lines(text)), budget_tokens), estimate_tokens(text or ""))
+    record("job", compacted)
+    return compacted
+
+
+def is_boilerplate_link(link):
+    domain = urlparse(link["url"]).netloc.lower()
+    if any(domain == social or domain.endswith("." + social) for social in SOCIAL_DOMAINS):
+        return True
+    text = link.get("text") or ""
+    return bool(text) and len(text) <= BOILERPLATE_MAX_LENGTH and bool(BOILERPLATE_PATTERNS.search(text))
+
+
+def compact_listing(text, links, budget_tokens, link_share=0.6):
+    """Links (with anchor text) are what the URL extractor needs, so they get
+    most of the budget; cleaned page text fills the rest."""
+    link_lines = [
+        f"{link['text'] or '-'} | {link['url']}"
+        for link in links or []
+        if not is_boilerplate_link(link)
+    ]
+    packed_links, used = pack_lines(link_lines, int(budget_tokens * link_share), allow_partial=False)
+    packed_text, _ = pack_lines(clean_lines(text), budget_tokens - used)
+
+    parts = []
+    if packed_links:
+        parts.append("LINKS (text | url):\n" + "\n".join(packed_links))
+    if packed_text:
+        parts.append("PAGE TEXT:\n" + "\n".join(packed_text))
+
+    original = estimate_tokens(text or "") + sum(estimate_tokens(line) for line in link_lines)
+    compacted = Compacted("\n\n".join(parts), original)
+    record("listing", compacted)
+    return compacted
@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """Caps how many workers may talk to the same host at once."""
+
+    def __init__(self, max_per_host):
+        self.max_per_host = max(1, max_per_host)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url):
+        semaphore = self._semaphore(urlparse(url).netloc.lower())
+        with semaphore:
+            yield
+
+
+class StageStats:
+    def __init__(self, workers):
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def record(self, started_at, finished_at, items=1):
+        with self._lock:
+            self.items += items
+            self.busy_seconds += finished_at - started_at
+            if self.started_at is None or started_at < self.started_at:
+                self.started_at = started_at
+            if self.finished_at is None or finished_at > self.finished_at:
+                self.finished_at = finished_at
+
+    @property
+    def wall_seconds(self):
+        if self.started_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def throughput(self):
+        return self.items / self.wall_seconds if self.wall_seconds else 0.0
+
+    def describe(self):
+        return (
+            f"{self.items} items in {self.wall_seconds:.1f}s "
+            f"({self.throughput * 60:.1f}/min, {self.workers} workers, "
+            f"{self.busy_seconds:.1f}s busy)"
+        )
+
+
+_DONE = object()
+
+
+def run_pipeline(items, produce, consume, producers, consumers, queue_size,
+                 on_producer_exit=None, on_consumer_exit=None):
+    """Feed ``items`` through ``produce`` workers into a bounded queue drained
+    by ``consume`` workers. ``produce`` returning None drops the item.
+
+    An exception from ``produce`` or ``consume`` is logged and drops that item;
+    it never kills the worker, which would leave producers blocked on a full
+    queue nobody drains.
+    """
+    source = queue.Queue()
+    for item in items:
+        source.put(item)
+    buffer = queue.Queue(maxsize=max(1, queue_size))
+    produce_stats = StageStats(producers)
+    consume_stats = StageStats(consumers)
+
+    def producer():
+        try:
+            while True:
+                try:
+                    item = source.get_nowait()
+                except queue.Empty:
+                    return
+                started_at = time.monotonic()
+                try:
+                    result = produce(item)
+                except Exception as e:
+                    print(f"❌ Pipeline item failed while loading: {str(e)[:50]}...")
+                    result = None
+                produce_stats.record(started_at, time.monotonic())
+                if result is not None:
+                    buffer.put(result)
+        finally:
+            if on_producer_exit:
+                on_producer_exit()
+
+    def consumer():
+        try:
+            while True:
+                item = buffer.get()
+                if item is _DONE:
+                    return
+                started_at = time.monotonic()
+                try:
+                    consume(item)
+                except Exception as e:
+                    print(f"❌ Pipeline item failed while processing: {str(e)[:50]}...")
+                consume_stats.record(started_at, time.monotonic())
+        finally:
+            if on_consumer_exit:
+                on_consumer_exit()
+
+    producer_threads = [threading.Thread(target=producer, name=f"producer-{n}") for n in range(producers)]
+    consumer_threads = [threading.Thread(target=consumer, name=f"consumer-{n}") for n in range(consumers)]
+    for thread in producer_threads + consumer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    for _ in consumer_threads:
+        buffer.put(_DONE)
+    for thread in consumer_threads:
+        thread.join()
+
+    return produce_stats, consume_stats
@@ -0,0 +1,94 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class AgentConfig:
+    # Browser pool
+    BROWSER_MAX_NAVIGATIONS = int(os.getenv("BROWSER_MAX_NAVIGATIONS", "40"))
+    BROWSER_MAX_IDLE_PAGES = int(os.getenv("BROWSER_MAX_IDLE_PAGES", "2"))
+
+    # Target crawling: "sequential" walks targets one by one through the graph,
+    # "concurrent" crawls several targets at once inside crawl_targets_concurrently
+    CRAWL_MODE = os.getenv("CRAWL_MODE", "sequential")
+    CRAWL_MAX_WORKERS = int(os.getenv("CRAWL_MAX_WORKERS", "4"))
+    CRAWL_MAX_PER_HOST = int(os.getenv("CRAWL_MAX_PER_HOST", "1"))
+
+    # Deep analysis pipeline: page fetchers feed a bounded queue drained by LLM scorers
+    ANALYSIS_FETCHERS = int(os.getenv("ANALYSIS_FETCHERS", "2"))
+    ANALYSIS_SCORERS = int(os.getenv("ANALYSIS_SCORERS", "2"))
+    ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", "8"))
+
+    # Model tiers as "provider:model" failover chains; providers without an API key are skipped.
+    # The fast tier handles link extraction and first-pass scoring, the strong tier
+    # re-scores jobs whose fast score lands in the escalation band.
+    LLM_FAST_MODELS = os.getenv("LLM_FAST_MODELS", "groq:llama3-8b-8192,openai:gpt-4o-mini,google:gemini-1.5-flash")
+    LLM_STRONG_MODELS = os.getenv("LLM_STRONG_MODELS", "groq:llama3-70b-8192,openai:gpt-4o,google:gemini-1.5-pro")
+    LLM_ESCALATION_ENABLED = os.getenv("LLM_ESCALATION_ENABLED", "true").lower() == "true"
+    LLM_ESCALATE_MIN_SCORE = int(os.getenv("LLM_ESCALATE_MIN_SCORE", "4"))
+    LLM_ESCALATE_MAX_SCORE = int(os.getenv("LLM_ESCALATE_MAX_SCORE", "6"))
+
+    # Client-side LLM budgets shared by every node (Groq free tier defaults)
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "30000"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    ANALYSIS_REQUEUE_ROUNDS = int(os.getenv("ANALYSIS_REQUEUE_ROUNDS", "3"))
+
+    # Jobs scored per LLM request (1 = one request per job)
+    SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "4"))
+
+    # Local keyword + TF-IDF pre-scoring; jobs scoring below the threshold skip the LLM
+    PRESCORE_ENABLED = os.getenv("PRESCORE_ENABLED", "true").lower() == "true"
+    PRESCORE_THRESHOLD = int(os.getenv("PRESCORE_THRESHOLD", "3"))
+    PRESCORE_IDF_SAMPLE = int(os.getenv("PRESCORE_IDF_SAMPLE", "500"))
+
+    # `python main.py --rescore`: stale jobs re-analyzed per run, in status priority order
+    RESCORE_MAX_JOBS = int(os.getenv("RESCORE_MAX_JOBS", "200"))
+    RESCORE_STATUSES = os.getenv("RESCORE_STATUSES", "Applied,Interested,New")
+
+    # Persistent LLM response cache (llm_cache table)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_TTL_HOURS = int(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+    # Skip targets whose first listing page is unchanged since the last run
+    FINGERPRINT_SKIP_ENABLED = os.getenv("FINGERPRINT_SKIP_ENABLED", "true").lower() == "true"
+    FINGERPRINT_MAX_AGE_DAYS = int(os.getenv("FINGERPRINT_MAX_AGE_DAYS", "7"))
+
+    # Stop paginating a target once a page yields no URLs missing from the jobs table
+    KNOWN_URL_CUTOFF_ENABLED = os.getenv("KNOWN_URL_CUTOFF_ENABLED", "true").lower() == "true"
+    KNOWN_URL_BLOOM_THRESHOLD = int(os.getenv("KNOWN_URL_BLOOM_THRESHOLD", "200000"))
+
+    # Rows per INSERT ... ON CONFLICT DO NOTHING statement when saving jobs
+    SAVE_BATCH_SIZE = int(os.getenv("SAVE_BATCH_SIZE", "100"))
+
+    # Write analyzed jobs as they are scored instead of holding them until save_jobs_to_db
+    STREAM_WRITES = os.getenv("STREAM_WRITES", "true").lower() == "true"
+    STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "10"))
+
+    # Playwright request interception; documents always load, see resource_blocker.py
+    BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "true").lower() == "true"
+    BLOCK_RESOURCE_TYPES = os.getenv("BLOCK_RESOURCE_TYPES", "image,media,font,stylesheet")
+    BLOCK_DOMAINS = os.getenv("BLOCK_DOMAINS", "")
+    ALLOW_DOMAINS = os.getenv("ALLOW_DOMAINS", "")
+    BLOCK_BYPASS_SITES = os.getenv("BLOCK_BYPASS_SITES", "")
+
+    # Job detail pages: try a pooled HTTP/2 client before rendering in Playwright
+    HTTP_FETCH_ENABLED = os.getenv("HTTP_FETCH_ENABLED", "true").lower() == "true"
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+    HTTP_MIN_TEXT_CHARS = int(os.getenv("HTTP_MIN_TEXT_CHARS", "500"))
+    FETCH_MODE_MAX_AGE_DAYS = int(os.getenv("FETCH_MODE_MAX_AGE_DAYS", "14"))
+
+    # HTML-to-text backend: auto (selectolax > lxml > bs4), bs4, lxml, selectolax or browser (innerText)
+    HTML_TEXT_BACKEND = os.getenv("HTML_TEXT_BACKEND", "auto")
+
+    # Prompt compaction: boilerplate removal and section-aware packing before LLM calls
+    PROMPT_COMPACTION_ENABLED = os.getenv("PROMPT_COMPACTION_ENABLED", "true").lower() == "true"
+    JOB_PROMPT_TOKEN_BUDGET = int(os.getenv("JOB_PROMPT_TOKEN_BUDGET", "1000"))
+    LISTING_PROMPT_TOKEN_BUDGET = int(os.getenv("LISTING_PROMPT_TOKEN_BUDGET", "3000"))
+
+    # Durable AgentState checkpoints for `python main.py --resume <run_id>`
+    CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    CHECKPOINT_URL = os.getenv("CHECKPOINT_URL", "checkpoints.sqlite")
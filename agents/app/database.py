@@ -1,16 +1,51 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import StaticPool
 from sqlmodel import create_engine, SQLModel
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+if DATABASE_URL and DATABASE_URL.startswith("sqlite"):
+    # Local testing: worker threads share the engine, and an in-memory database
+    # only exists on the one connection that created it.
+    sqlite_options = {"connect_args": {"check_same_thread": False}}
+    if ":memory:" in DATABASE_URL or DATABASE_URL in ("sqlite://", "sqlite:///"):
+        sqlite_options["poolclass"] = StaticPool
+    engine = create_engine(DATABASE_URL, **sqlite_options)
+else:
+    engine = create_engine(DATABASE_URL)
+
+
+def add_missing_columns():
+    """create_all never alters existing tables, so add the nullable columns
+    models gained after a table was first created (e.g. jobs.profile_version)."""
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    added = []
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    print(f"⚠️ Cannot add required column {table.name}.{column.name} automatically")
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"))
+                added.append(f"{table.name}.{column.name}")
+    return added
 
 
 def create_db_and_tables():
     try:
         SQLModel.metadata.create_all(engine)
+        for column in add_missing_columns():
+            print(f"🧱 Added column {column}")
         print("✅ Database initialized successfully")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
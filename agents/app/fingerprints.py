@@ -0,0 +1,66 @@
+import datetime
+import hashlib
+import re
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from sqlmodel import Session, select
+
+from .config import AgentConfig
+from .database import engine
+from .models import PageFingerprint
+
+
+def canonical_url(url):
+    parsed = urlparse(url.strip())
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, "", query, ""))
+
+
+def page_fingerprint(links, text):
+    # The link set is stable across cosmetic changes (dates, banners); fall back
+    # to the visible text for pages that render their listings without anchors.
+    if links:
+        material = "\n".join(sorted({canonical_url(link["url"]) for link in links}))
+    else:
+        material = re.sub(r"\s+", " ", text or "").strip()
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def is_unchanged(url, fingerprint):
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=AgentConfig.FINGERPRINT_MAX_AGE_DAYS)
+    try:
+        with Session(engine) as session:
+            stored = session.exec(
+                select(PageFingerprint.fingerprint).where(
+                    PageFingerprint.url == canonical_url(url),
+                    PageFingerprint.updated_at >= cutoff,
+                )
+            ).first()
+    except Exception as e:
+        print(f"⚠️ Fingerprint lookup failed: {str(e)[:50]}...")
+        return False
+    return stored == fingerprint
+
+
+def persisted_fingerprints(pending, failed_job_urls):
+    """Entries from ``pending`` (url -> [fingerprint, link_count, job_urls])
+    whose job URLs were all fetched, scored and saved; a listing with a failed job
+    must be crawled again next run rather than skipped as unchanged."""
+    failed = set(failed_job_urls or [])
+    return {
+        url: entry for url, entry in pending.items()
+        if not failed.intersection(entry[2])
+    }
+
+
+def save_fingerprints(fingerprints):
+    if not fingerprints:
+        return 0
+    now = datetime.datetime.now(datetime.timezone.utc)
+    with Session(engine) as session:
+        for url, (fingerprint, link_count, _) in fingerprints.items():
+            session.merge(PageFingerprint(
+                url=canonical_url(url), fingerprint=fingerprint, link_count=link_count, updated_at=now
+            ))
+        session.commit()
+    return len(fingerprints)
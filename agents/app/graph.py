@@ -10,26 +10,39 @@ from .agent_nodes import (
     aggregate_and_filter_urls,
     deep_job_analysis,
     save_jobs_to_db,
-    prepare_for_next_page
+    prepare_for_next_page,
+    finalize_run,
+    crawl_targets_concurrently,
+    collect_ats_postings,
+    has_more_pages
 )
-from .models import JobListing, Job, UserProfile
+from .config import AgentConfig
 
 class AgentState(TypedDict):
     targets: List[str]
+    ats_targets: List[dict]
     current_target: str
     current_page_url: str
     page_content: str
-    all_collected_urls: set
-    current_target_urls: set
+    page_links: List[dict]
+    all_collected_urls: List[str]
+    current_target_urls: List[str]
     filtered_job_urls: List[str]
-    processed_jobs: List[Job]
+    processed_jobs: List[dict]
+    saved_job_ids: List[int]
+    analysis_stats: dict
     next_page_url: Optional[str]
-    user_profile: Optional[UserProfile]
+    user_profile: Optional[dict]
     pages_processed_for_target: int
-    visited_urls: set
+    visited_urls: List[str]
     target_stats: dict
+    page_unchanged: bool
+    unseen_urls_on_page: int
+    pending_fingerprints: dict
+    page_fingerprint: Optional[list]
+    failed_job_urls: List[str]
 
-def create_workflow():
+def create_workflow(checkpointer=None):
     workflow = StateGraph(AgentState)
 
     workflow.add_node("initialize_agent", initialize_agent)
@@ -41,6 +54,9 @@ def create_workflow():
     workflow.add_node("deep_job_analysis", deep_job_analysis)
     workflow.add_node("save_jobs_to_db", save_jobs_to_db)
     workflow.add_node("prepare_for_next_page", prepare_for_next_page)
+    workflow.add_node("finalize_run", finalize_run)
+    workflow.add_node("crawl_targets_concurrently", crawl_targets_concurrently)
+    workflow.add_node("collect_ats_postings", collect_ats_postings)
 
     def should_continue_to_next_company(state):
         if state is None or state.get("user_profile") is None:
@@ -51,49 +67,49 @@ def create_workflow():
             return "aggregate_and_filter_urls"
 
     def should_paginate(state):
-        next_url = state.get("next_page_url")
-        pages_done = state.get("pages_processed_for_target", 0)
-        current_url = state.get("current_page_url", "")
-        
-        if any(term in current_url for term in ["university", "intern", "graduate", "campus", "fresher", "entry-level"]):
-            max_pages = 3
-        elif any(domain in current_url for domain in ["google.com", "metacareers.com", "apple.com", "amazon.jobs", "jobs.netflix.com"]):
-            max_pages = 5
-        elif any(domain in current_url for domain in ["naukri.com", "shine.com", "foundit.in", "linkedin.com"]):
-            max_pages = 8
-        elif any(domain in current_url for domain in ["wellfound.com", "startup.jobs", "builtin.com", "ycombinator.com"]):
-            max_pages = 6
-        elif any(domain in current_url for domain in ["tcs.com", "infosys.com", "wipro.com", "accenture.com", "ibm.com"]):
-            max_pages = 4
-        else:
-            max_pages = 3
-        
-        if not next_url:
-            print(f"📄 Pagination complete for target")
-            return "finalize_target_urls"
-        
-        if pages_done >= max_pages:
-            print(f"📄 Page limit reached ({max_pages}) for target")
-            return "finalize_target_urls"
-        
-        print(f"📄 Continuing pagination ({pages_done}/{max_pages})")
-        return "prepare_for_next_page"
+        if has_more_pages(state):
+            return "prepare_for_next_page"
+        return "finalize_target_urls"
 
     workflow.set_entry_point("initialize_agent")
     
     workflow.add_edge("navigate_to_page", "extract_job_urls")
     workflow.add_edge("prepare_for_next_page", "navigate_to_page")
     workflow.add_edge("finalize_target_urls", "get_next_target")
+    workflow.add_edge("crawl_targets_concurrently", "aggregate_and_filter_urls")
     
     workflow.add_edge("aggregate_and_filter_urls", "deep_job_analysis")
     
     workflow.add_edge("deep_job_analysis", "save_jobs_to_db")
-    workflow.add_edge("save_jobs_to_db", END)
+    workflow.add_edge("save_jobs_to_db", "finalize_run")
+    workflow.add_edge("finalize_run", END)
     
+    def should_start(state):
+        if not state or not state.get("user_profile"):
+            return END
+        return "collect_ats_postings"
+
+    def choose_crawl_mode(state):
+        if AgentConfig.CRAWL_MODE == "concurrent":
+            return "crawl_targets_concurrently"
+        return "get_next_target"
+
     workflow.add_conditional_edges(
         "initialize_agent",
-        lambda state: "get_next_target" if state and state.get("user_profile") else END,
-        {"get_next_target": "get_next_target", END: END}
+        should_start,
+        {
+            "collect_ats_postings": "collect_ats_postings",
+            END: END
+        }
+    )
+
+    workflow.add_conditional_edges(
+        "collect_ats_postings",
+        choose_crawl_mode,
+        {
+            "get_next_target": "get_next_target",
+            "crawl_targets_concurrently": "crawl_targets_concurrently"
+        }
     )
 
     workflow.add_conditional_edges(
@@ -114,6 +130,6 @@ def create_workflow():
         }
     )
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 app = create_workflow()
@@ -0,0 +1,194 @@
+from functools import lru_cache
+from bs4 import BeautifulSoup
+
+from .config import AgentConfig
+from .link_extractor import collect_links, build_links
+
+LISTING_DROP_TAGS = ["script", "style", "noscript", "iframe"]
+DETAIL_DROP_TAGS = ["script", "style", "nav", "footer", "header", "aside"]
+JSON_LD_TYPE = "application/ld+json"
+COMPANY_SELECTORS = [".company-name", ".employer", ".company", "[data-company]"]
+
+HTML_BACKENDS = ["selectolax", "lxml", "bs4"]
+
+# Runs inside the page: prune, then read innerText without serializing the DOM.
+BROWSER_EXTRACT_JS = """([dropTags, companySelectors]) => {
+    const structuredData = Array.from(
+        document.querySelectorAll('script[type="application/ld+json"]'), s => s.textContent
+    );
+    for (const el of document.querySelectorAll(dropTags.join(","))) el.remove();
+    const links = Array.from(document.querySelectorAll("a[href]"), a => [
+        a.getAttribute("href"),
+        a.textContent || "",
+        a.getAttribute("rel") || "",
+        a.getAttribute("aria-label") || "",
+    ]);
+    let company = null;
+    for (const selector of companySelectors) {
+        const el = document.querySelector(selector);
+        if (el) { company = el.textContent.trim(); break; }
+    }
+    return {
+        text: document.body ? document.body.innerText : "",
+        title: document.title || null,
+        links,
+        company,
+        structuredData,
+    };
+}"""
+
+
+def clean_lines(text):
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def parse_bs4(html, base_url, drop_tags):
+    soup = BeautifulSoup(html, "html.parser")
+    structured_data = [script.get_text() for script in soup.find_all("script", type=JSON_LD_TYPE)]
+    for element in soup(drop_tags):
+        element.decompose()
+
+    title = soup.find("title")
+    company = None
+    for selector in COMPANY_SELECTORS:
+        company_elem = soup.select_one(selector)
+        if company_elem:
+            company = company_elem.get_text().strip()
+            break
+
+    return {
+        "text": soup.get_text(separator="\n", strip=True),
+        "title": title.get_text().strip() if title else None,
+        "company": company,
+        "links": collect_links(soup, base_url),
+        "structured_data": structured_data,
+    }
+
+
+def parse_lxml(html, base_url, drop_tags):
+    from lxml import etree, html as lxml_html
+
+    if not html.strip():
+        return {"text": "", "title": None, "company": None, "links": [], "structured_data": []}
+    root = lxml_html.document_fromstring(html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8"))
+    structured_data = [script.text or "" for script in root.xpath(f'//script[@type="{JSON_LD_TYPE}"]')]
+    etree.strip_elements(root, etree.Comment, *drop_tags, with_tail=False)
+
+    texts = (text.strip() for text in root.itertext())
+    title = root.findtext(".//title")
+    company = None
+    for selector in COMPANY_SELECTORS:
+        if selector.startswith("."):
+            xpath = f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+        else:
+            xpath = f"//*[@{selector.strip('[]')}]"
+        matches = root.xpath(xpath)
+        if matches:
+            company = matches[0].text_content().strip()
+            break
+
+    anchors = (
+        (a.get("href"), a.text_content(), a.get("rel"), a.get("aria-label"))
+        for a in root.iter("a") if a.get("href") is not None
+    )
+    return {
+        "text": "\n".join(text for text in texts if text),
+        "title": title.strip() if title else None,
+        "company": company,
+        "links": build_links(anchors, base_url),
+        "structured_data": structured_data,
+    }
+
+
+def parse_selectolax(html, base_url, drop_tags):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    structured_data = [script.text() for script in tree.css(f'script[type="{JSON_LD_TYPE}"]')]
+    tree.strip_tags(drop_tags)
+
+    title = tree.css_first("title")
+    company = None
+    for selector in COMPANY_SELECTORS:
+        company_elem = tree.css_first(selector)
+        if company_elem:
+            company = company_elem.text().strip()
+            break
+
+    anchors = (
+        (a.attributes.get("href"), a.text(), a.attributes.get("rel"), a.attributes.get("aria-label"))
+        for a in tree.css("a[href]")
+    )
+    body = tree.root
+    return {
+        "text": clean_lines(body.text(separator="\n", strip=True)) if body else "",
+        "title": title.text().strip() if title else None,
+        "company": company,
+        "links": build_links(anchors, base_url),
+        "structured_data": structured_data,
+    }
+
+
+PARSERS = {"bs4": parse_bs4, "lxml": parse_lxml, "selectolax": parse_selectolax}
+
+
+def backend_available(name):
+    if name in ("bs4", "browser"):
+        return True
+    try:
+        __import__({"lxml": "lxml.html", "selectolax": "selectolax.lexbor"}[name])
+    except ImportError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(name=None):
+    name = (name or AgentConfig.HTML_TEXT_BACKEND).lower()
+    if name == "auto":
+        return next(backend for backend in HTML_BACKENDS if backend_available(backend))
+    if name not in PARSERS and name != "browser":
+        print(f"⚠️ Unknown HTML text backend '{name}', using bs4")
+        return "bs4"
+    if not backend_available(name):
+        print(f"⚠️ HTML text backend '{name}' is not installed, using bs4")
+        return "bs4"
+    return name
+
+
+def html_parser(backend=None):
+    # "browser" only applies to live pages; raw HTML (HTTP fetches, JSON-LD
+    # and ATS descriptions) goes to the best installed parser instead.
+    name = resolve_backend(backend)
+    if name == "browser":
+        name = resolve_backend("auto")
+    return PARSERS[name]
+
+
+def parse_html(html, base_url, drop_tags, backend=None):
+    return html_parser(backend)(html, base_url, drop_tags)
+
+
+def extract_page(page, base_url, drop_tags, backend=None):
+    """Read text, title, company, links and JSON-LD blocks from a loaded Playwright page.
+
+    ``size`` is the length of the serialized HTML, or of the visible text for
+    the browser backend, which never serializes the DOM.
+    """
+    backend = resolve_backend(backend)
+    if backend == "browser":
+        result = page.evaluate(BROWSER_EXTRACT_JS, [drop_tags, COMPANY_SELECTORS])
+        text = clean_lines(result["text"] or "")
+        return {
+            "text": text,
+            "title": (result["title"] or "").strip() or None,
+            "company": result["company"] or None,
+            "links": build_links(result["links"], base_url),
+            "structured_data": result["structuredData"],
+            "size": len(text),
+        }
+
+    html = page.content()
+    document = PARSERS[backend](html, base_url, drop_tags)
+    document["size"] = len(html)
+    return document
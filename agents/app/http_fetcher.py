@@ -0,0 +1,183 @@
+import datetime
+import re
+import threading
+import httpx
+from sqlmodel import Session
+
+from .config import AgentConfig
+from .database import engine
+from .models import DomainFetchMode
+from .browser_pool import USER_AGENT, DEFAULT_HEADERS
+from .link_extractor import get_domain
+from .html_text import parse_html, DETAIL_DROP_TAGS
+from .structured_data import find_job_posting
+from .metrics import metrics
+
+HTTP_MODE = "http"
+BROWSER_MODE = "browser"
+
+# Markers of pages that only render with JavaScript or sit behind a bot check.
+NEEDS_JS_PATTERNS = re.compile(
+    r"enable javascript|javascript is (?:required|disabled)|requires javascript"
+    r"|just a moment\.\.\.|checking your browser|captcha",
+    re.IGNORECASE,
+)
+ESCALATE_STATUS_CODES = {401, 403, 406, 429, 503}
+# The posting is gone; a browser would get the same answer.
+GONE_STATUS_CODES = {404, 410}
+
+# Why fetch() handed a page back without a document. Only NEEDS_BROWSER says
+# anything about the domain; the others are about this request.
+NEEDS_BROWSER = "needs_browser"
+TRANSIENT = "transient"
+GONE = "gone"
+
+
+def looks_complete(document):
+    # Client-rendered ATS pages often still ship the full posting as JSON-LD.
+    posting = find_job_posting(document.get("structured_data"))
+    if posting and len(posting.get("description") or "") >= AgentConfig.HTTP_MIN_TEXT_CHARS:
+        return True
+    text = document["text"]
+    if len(text) < AgentConfig.HTTP_MIN_TEXT_CHARS:
+        return False
+    # A few hundred chars of "please enable JavaScript" shell is still a shell.
+    return not (NEEDS_JS_PATTERNS.search(text[:2000]) and len(text) < AgentConfig.HTTP_MIN_TEXT_CHARS * 3)
+
+
+class TieredFetcher:
+    """Fetches job detail pages with a pooled HTTP/2 client and tells the
+    caller when a page has to be rendered in Playwright instead.
+
+    The mode that worked is remembered per domain (domain_fetch_modes table),
+    so browser-only sites skip the HTTP attempt on later runs until
+    ``FETCH_MODE_MAX_AGE_DAYS`` passes and HTTP is probed again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._modes = {}
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                headers = {k: v for k, v in DEFAULT_HEADERS.items() if k != "Accept-Encoding"}
+                headers["User-Agent"] = USER_AGENT
+                limits = httpx.Limits(
+                    max_connections=AgentConfig.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=AgentConfig.HTTP_MAX_CONNECTIONS,
+                )
+                try:
+                    self._client = httpx.Client(
+                        http2=True, headers=headers, limits=limits,
+                        timeout=AgentConfig.HTTP_TIMEOUT_SECONDS, follow_redirects=True,
+                    )
+                except ImportError:
+                    print("⚠️ h2 not installed, HTTP fetcher falling back to HTTP/1.1")
+                    self._client = httpx.Client(
+                        headers=headers, limits=limits,
+                        timeout=AgentConfig.HTTP_TIMEOUT_SECONDS, follow_redirects=True,
+                    )
+            return self._client
+
+    def _stored_mode(self, domain):
+        with self._lock:
+            if domain in self._modes:
+                return self._modes[domain]
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=AgentConfig.FETCH_MODE_MAX_AGE_DAYS)
+        mode = None
+        try:
+            with Session(engine) as session:
+                row = session.get(DomainFetchMode, domain)
+                if row:
+                    updated_at = row.updated_at
+                    if updated_at.tzinfo is None:
+                        updated_at = updated_at.replace(tzinfo=datetime.timezone.utc)
+                    mode = row.mode if row.mode == HTTP_MODE or updated_at >= cutoff else None
+        except Exception as e:
+            print(f"⚠️ Fetch mode lookup failed: {str(e)[:50]}...")
+        with self._lock:
+            self._modes.setdefault(domain, mode)
+            return self._modes[domain]
+
+    def _remember(self, domain, mode):
+        with self._lock:
+            changed = self._modes.get(domain) != mode
+            self._modes[domain] = mode
+        try:
+            with Session(engine) as session:
+                row = session.get(DomainFetchMode, domain) or DomainFetchMode(domain=domain, mode=mode)
+                if mode == HTTP_MODE:
+                    row.http_successes = (row.http_successes or 0) + 1
+                else:
+                    row.escalations = (row.escalations or 0) + 1
+                row.mode = mode
+                row.updated_at = datetime.datetime.now(datetime.timezone.utc)
+                session.add(row)
+                session.commit()
+        except Exception as e:
+            print(f"⚠️ Fetch mode save failed: {str(e)[:50]}...")
+            return
+        if changed:
+            print(f"🧠 {domain} will be fetched with {mode}")
+
+    def should_try_http(self, url):
+        return AgentConfig.HTTP_FETCH_ENABLED and self._stored_mode(get_domain(url)) != BROWSER_MODE
+
+    def fetch(self, url):
+        """Return ``(document, None)``, or ``(None, reason)`` when HTTP did not
+        get the page: GONE for a 404/410, NEEDS_BROWSER for a JavaScript shell
+        or bot check, TRANSIENT for network errors and other error statuses."""
+        domain = get_domain(url)
+        try:
+            with metrics.timer("http_fetch"):
+                response = self._get_client().get(url)
+        except httpx.HTTPError as e:
+            print(f"⚠️ HTTP fetch failed, escalating: {str(e)[:50]}...")
+            metrics.incr("http_fetch_escalations")
+            return None, TRANSIENT
+
+        status = response.status_code
+        if status in GONE_STATUS_CODES:
+            print(f"⚠️ Job page gone (HTTP {status}): {url[:60]}...")
+            metrics.incr("http_fetch_gone")
+            return None, GONE
+        if "html" not in response.headers.get("content-type", ""):
+            metrics.incr("http_fetch_escalations")
+            return None, TRANSIENT
+        if status >= 400:
+            # A bot wall (403 "checking your browser") is a property of the site;
+            # a 429 or a 5xx is about this request, so the browser covers it once.
+            metrics.incr("http_fetch_escalations")
+            challenged = status in ESCALATE_STATUS_CODES and NEEDS_JS_PATTERNS.search(response.text[:5000])
+            return None, NEEDS_BROWSER if challenged else TRANSIENT
+
+        html = response.text
+        with metrics.timer("html_to_text"):
+            document = parse_html(html, str(response.url), DETAIL_DROP_TAGS)
+        document["size"] = len(html)
+        if not looks_complete(document):
+            metrics.incr("http_fetch_escalations")
+            return None, NEEDS_BROWSER
+
+        metrics.incr("http_fetches")
+        if self._modes.get(domain) != HTTP_MODE:
+            self._remember(domain, HTTP_MODE)
+        return document, None
+
+    def record_browser_success(self, url):
+        """HTTP got a JavaScript shell or bot check but Playwright got the content."""
+        domain = get_domain(url)
+        if AgentConfig.HTTP_FETCH_ENABLED and self._modes.get(domain) != BROWSER_MODE:
+            self._remember(domain, BROWSER_MODE)
+
+    def close(self):
+        with self._lock:
+            client, self._client = self._client, None
+            self._modes = {}
+        if client is not None:
+            client.close()
+
+
+http_fetcher = TieredFetcher()
@@ -0,0 +1,37 @@
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from .models import Job
+
+SCORE_BANDS = {
+    "high_match": Job.match_score >= 8,
+    "medium_match": Job.match_score.between(5, 7),
+    "low_match": Job.match_score < 5,
+}
+
+
+def status_key(status: Optional[str]) -> str:
+    return f'status_{(status or "unknown").lower().replace(" ", "_")}'
+
+
+def get_job_stats(session: Session, bands: Dict = SCORE_BANDS, where=None) -> Dict:
+    """Count jobs per status and per score band in a single grouped query.
+
+    ``bands`` maps a counter name to a SQL condition, so other reports can ask
+    for their own breakdowns; ``where`` narrows the rows being counted.
+    """
+    band_columns = [func.count().filter(condition).label(name) for name, condition in bands.items()]
+    statement = select(Job.status, func.count().label("total"), *band_columns).group_by(Job.status)
+    if where is not None:
+        statement = statement.where(where)
+
+    stats = {"total_jobs": 0}
+    stats.update({name: 0 for name in bands})
+    for row in session.exec(statement).all():
+        row = row._mapping
+        stats["total_jobs"] += row["total"]
+        stats[status_key(row["status"])] = row["total"]
+        for name in bands:
+            stats[name] += row[name]
+    return stats
@@ -0,0 +1,122 @@
+import threading
+from sqlalchemy import String, any_, bindparam, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from .database import engine
+from .models import Job
+from .known_urls import known_urls
+
+UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def job_row(job):
+    return job.model_dump(exclude={"id"})
+
+
+def insert_jobs(session: Session, jobs) -> list:
+    """Insert ``jobs`` in one statement, skipping URLs already stored.
+
+    Returns the ids of the rows actually inserted; anything missing from the
+    result was a duplicate (either already in the table or repeated in ``jobs``).
+    """
+    if not jobs:
+        return []
+
+    insert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if insert is None:
+        return _insert_jobs_row_by_row(session, jobs)
+
+    statement = (
+        insert(Job)
+        .values([job_row(job) for job in jobs])
+        .on_conflict_do_nothing(index_elements=["url"])
+        .returning(Job.id)
+    )
+    return list(session.exec(statement).scalars().all())
+
+
+def _insert_jobs_row_by_row(session: Session, jobs) -> list:
+    inserted_ids = []
+    seen_urls = set()
+    for job in jobs:
+        if job.url in seen_urls or session.exec(select(Job.id).where(Job.url == job.url)).first():
+            continue
+        seen_urls.add(job.url)
+        new_job = Job(**job_row(job))
+        session.add(new_job)
+        session.flush()
+        inserted_ids.append(new_job.id)
+    return inserted_ids
+
+
+def find_existing_urls(session: Session, urls) -> set:
+    """Return the subset of ``urls`` already stored, in a single round trip."""
+    urls = list(urls)
+    if not urls:
+        return set()
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        candidates = bindparam("urls", value=urls, type_=postgresql.ARRAY(String))
+        return set(session.exec(select(Job.url).where(Job.url == any_(candidates))).all())
+
+    if dialect == "sqlite":
+        connection = session.connection()
+        connection.execute(text("CREATE TEMP TABLE IF NOT EXISTS candidate_urls (url TEXT PRIMARY KEY)"))
+        connection.execute(text("DELETE FROM candidate_urls"))
+        connection.execute(
+            text("INSERT OR IGNORE INTO candidate_urls (url) VALUES (:url)"),
+            [{"url": url} for url in urls],
+        )
+        rows = connection.execute(text("SELECT jobs.url FROM jobs JOIN candidate_urls ON candidate_urls.url = jobs.url"))
+        existing = {row[0] for row in rows}
+        connection.execute(text("DELETE FROM candidate_urls"))
+        return existing
+
+    return set(session.exec(select(Job.url).where(Job.url.in_(urls))).all())
+
+
+class JobWriter:
+    """Buffers analyzed jobs from scoring workers and flushes them in small batches."""
+
+    def __init__(self, batch_size):
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._pending = []
+        self.saved_ids = []
+        self.duplicates = 0
+        self.failed = 0
+        self.failed_urls = []
+
+    def add(self, job):
+        with self._lock:
+            self._pending.append(job)
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def flush(self):
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            with Session(engine) as session:
+                inserted_ids = insert_jobs(session, batch)
+                session.commit()
+        except Exception as e:
+            print(f"❌ Streaming save failed for {len(batch)} jobs: {str(e)[:50]}...")
+            self.failed += len(batch)
+            self.failed_urls.extend(job.url for job in batch)
+            return
+        self.saved_ids.extend(inserted_ids)
+        self.duplicates += len(batch) - len(inserted_ids)
+        for job in batch:
+            known_urls.add(job.url)
+        print(f"💾 Streamed {len(inserted_ids)} jobs to database ({len(self.saved_ids)} so far)")
@@ -0,0 +1,75 @@
+import hashlib
+import math
+import threading
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from .config import AgentConfig
+from .database import engine
+from .models import Job
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:16], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, item):
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+class KnownUrlIndex:
+    """In-memory membership test for URLs already stored in the jobs table.
+
+    Used only to stop paginating early, never to drop URLs: the database check in
+    aggregate_and_filter_urls stays authoritative, so a Bloom filter false
+    positive on large tables can at worst end a target one page sooner.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._members = set()
+        self.loaded = False
+        self.size = 0
+
+    def load(self):
+        with Session(engine) as session:
+            total = session.exec(select(func.count()).select_from(Job)).one()
+            if total >= AgentConfig.KNOWN_URL_BLOOM_THRESHOLD:
+                members = BloomFilter(total * 2)
+            else:
+                members = set()
+            for url in session.exec(select(Job.url).execution_options(yield_per=5000)):
+                members.add(url)
+
+        with self._lock:
+            self._members = members
+            self.size = total
+            self.loaded = True
+        return self
+
+    def add(self, url):
+        """Record a URL saved during this run, so later pages see it as known."""
+        with self._lock:
+            if not self.loaded or url in self._members:
+                return
+            self._members.add(url)
+            self.size += 1
+
+    def __contains__(self, url):
+        return url in self._members
+
+
+known_urls = KnownUrlIndex()
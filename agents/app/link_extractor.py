@@ -0,0 +1,182 @@
+import datetime
+import re
+import threading
+from collections import Counter
+from urllib.parse import urljoin, urlparse
+from sqlmodel import Session
+
+from .database import engine
+from .models import SiteLinkPattern
+
+# Path shapes that identify a single posting on most career sites and job boards.
+GENERIC_JOB_PATTERNS = [
+    r"/jobs?/(?:view/|details?/)?[^/]*\d[^/]*/?$",
+    r"/jobs?/[^/]+/[^/]*\d[^/]*/?$",
+    r"/(?:job-listings?|jobdetail|job-detail|viewjob|positions?|openings?|postings?)/[^/]+",
+    r"/careers?/(?:job|position|opening)s?/[^/]+",
+]
+GENERIC_MIN_MATCHES = 3
+NEXT_PAGE_TEXT = {"next", "next page", "next »", "›", "»", ">", "load more"}
+
+
+def get_domain(url):
+    domain = urlparse(url).netloc.lower()
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+def collect_links(soup, base_url):
+    anchors = (
+        (anchor["href"], anchor.get_text(" ", strip=True), anchor.get("rel"), anchor.get("aria-label"))
+        for anchor in soup.find_all("a", href=True)
+    )
+    return build_links(anchors, base_url)
+
+
+def build_links(anchors, base_url):
+    """Turn (href, text, rel, aria-label) tuples from any HTML backend into link dicts."""
+    links = []
+    seen = set()
+    for href, text, rel, label in anchors:
+        href = (href or "").strip()
+        if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
+            continue
+        absolute = urljoin(base_url, href)
+        if absolute in seen:
+            continue
+        seen.add(absolute)
+        if isinstance(rel, str):
+            rel = rel.split()
+        links.append({
+            "url": absolute,
+            "text": " ".join((text or "").split())[:80],
+            "rel": " ".join(rel or []).lower(),
+            "label": (label or "").lower(),
+        })
+    return links
+
+
+def learn_path_pattern(urls):
+    """Generalise a set of job URL paths into one regex, keeping segments they share."""
+    split_paths = [[s for s in urlparse(url).path.split("/") if s] for url in urls]
+    if not split_paths:
+        return None
+    length, _ = Counter(len(parts) for parts in split_paths).most_common(1)[0]
+    same_shape = [parts for parts in split_paths if len(parts) == length]
+    if length == 0 or len(same_shape) < 2:
+        return None
+
+    segments = []
+    for column in zip(*same_shape):
+        if len(set(column)) == 1:
+            segments.append(re.escape(column[0]))
+        else:
+            segments.append(r"[^/]+")
+    if all(segment == r"[^/]+" for segment in segments):
+        return None
+    return "^/" + "/".join(segments) + "/?$"
+
+
+class LinkExtractor:
+    """Rule-based job/next-page link picker used before falling back to the LLM.
+
+    Patterns come from ``link_patterns`` in config.json, from patterns learned
+    after successful LLM extractions (site_link_patterns table), and finally
+    from generic job-URL heuristics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.configured = {}
+        self._learned = {}
+
+    def configure(self, link_patterns):
+        self.configured = {get_domain(f"//{domain}"): patterns for domain, patterns in (link_patterns or {}).items()}
+
+    def _learned_pattern(self, domain):
+        with self._lock:
+            if domain in self._learned:
+                return self._learned[domain]
+        try:
+            with Session(engine) as session:
+                row = session.get(SiteLinkPattern, domain)
+                pattern = {"job": row.job_url_pattern, "next": row.next_page_pattern} if row else None
+        except Exception as e:
+            print(f"⚠️ Link pattern lookup failed: {str(e)[:50]}...")
+            pattern = None
+        with self._lock:
+            self._learned[domain] = pattern
+        return pattern
+
+    def _match(self, links, page_url, job_patterns, min_matches):
+        page_path = urlparse(page_url).path.rstrip("/")
+        matched = []
+        for link in links:
+            parsed = urlparse(link["url"])
+            if parsed.path.rstrip("/") == page_path:
+                continue
+            if any(re.search(pattern, parsed.path) for pattern in job_patterns):
+                matched.append(link["url"])
+        return matched if len(matched) >= min_matches else []
+
+    def _find_next_page(self, links, page_url, next_pattern):
+        for link in links:
+            if link["url"].split("#")[0] == page_url:
+                continue
+            if next_pattern and re.search(next_pattern, link["url"]):
+                return link["url"]
+            if "next" in link["rel"] or link["label"].startswith("next"):
+                return link["url"]
+            if link["text"].lower() in NEXT_PAGE_TEXT:
+                return link["url"]
+        return None
+
+    def extract(self, page_url, links):
+        if not links:
+            return [], None
+
+        domain = get_domain(page_url)
+        sources = []
+        if domain in self.configured:
+            sources.append(("configured", self.configured[domain], 1))
+        learned = self._learned_pattern(domain)
+        if learned:
+            sources.append(("learned", learned, 1))
+        sources.append(("generic", {"job": GENERIC_JOB_PATTERNS}, GENERIC_MIN_MATCHES))
+
+        for source, patterns, min_matches in sources:
+            job_patterns = patterns.get("job") or []
+            if isinstance(job_patterns, str):
+                job_patterns = [job_patterns]
+            job_urls = self._match(links, page_url, job_patterns, min_matches)
+            if job_urls:
+                print(f"🧭 {source.title()} link patterns matched {len(job_urls)} job URLs")
+                return job_urls, self._find_next_page(links, page_url, patterns.get("next"))
+
+        return [], None
+
+    def learn(self, page_url, job_urls):
+        domain = get_domain(page_url)
+        same_site = [url for url in job_urls if get_domain(url) == domain]
+        pattern = learn_path_pattern(same_site)
+        if not pattern:
+            return None
+
+        try:
+            with Session(engine) as session:
+                row = session.get(SiteLinkPattern, domain) or SiteLinkPattern(domain=domain, job_url_pattern=pattern)
+                row.job_url_pattern = pattern
+                row.successes = (row.successes or 0) + 1
+                row.updated_at = datetime.datetime.now(datetime.timezone.utc)
+                session.add(row)
+                session.commit()
+        except Exception as e:
+            print(f"⚠️ Link pattern save failed: {str(e)[:50]}...")
+            return None
+
+        with self._lock:
+            self._learned[domain] = {"job": pattern, "next": None}
+        print(f"🧠 Learned job URL pattern for {domain}: {pattern}")
+        return pattern
+
+
+link_extractor = LinkExtractor()
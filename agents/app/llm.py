@@ -0,0 +1,155 @@
+import os
+import time
+from dotenv import load_dotenv
+
+from .config import AgentConfig
+from .metrics import metrics
+from .rate_limiter import RateLimitedLLM, RateLimitExceeded
+from .llm_cache import CachedLLM
+
+load_dotenv()
+API_KEYS = {
+    "groq": os.getenv("GROQ_API_KEY"),
+    "openai": os.getenv("OPENAI_API_KEY"),
+    "google": os.getenv("GOOGLE_API_KEY"),
+}
+
+FAST_TIER = "fast"
+STRONG_TIER = "strong"
+
+# USD per million input/output tokens, for the run summary's cost estimate only.
+MODEL_PRICES = {
+    "llama3-8b-8192": (0.05, 0.08),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama3-70b-8192": (0.59, 0.79),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+}
+
+
+def create_chat_model(provider, model):
+    # Retries are owned by RateLimitedLLM so a 429 is never retried blindly by the client.
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(temperature=0, groq_api_key=API_KEYS["groq"], model_name=model, max_retries=0)
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(temperature=0, api_key=API_KEYS["openai"], model=model, max_retries=0)
+    if provider == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(temperature=0, google_api_key=API_KEYS["google"], model=model, max_retries=0)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def parse_model_chain(spec):
+    """"groq:llama3-8b-8192,openai:gpt-4o-mini" -> [(provider, model), ...],
+    keeping only providers with an API key."""
+    chain = []
+    for entry in (spec or "").split(","):
+        provider, _, model = entry.strip().partition(":")
+        provider = provider.strip().lower()
+        if model.strip() and API_KEYS.get(provider):
+            chain.append((provider, model.strip()))
+    return chain
+
+
+def build_provider(provider, model, max_retries):
+    limited = RateLimitedLLM(
+        create_chat_model(provider, model),
+        requests_per_minute=AgentConfig.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=AgentConfig.LLM_TOKENS_PER_MINUTE,
+        max_retries=max_retries,
+    )
+    return CachedLLM(
+        limited,
+        ttl_hours=AgentConfig.LLM_CACHE_TTL_HOURS,
+        max_entries=AgentConfig.LLM_CACHE_MAX_ENTRIES,
+        enabled=AgentConfig.LLM_CACHE_ENABLED,
+    )
+
+
+class LLMRouter:
+    """Sends each call to a model tier and fails over along that tier's
+    provider chain.
+
+    A provider still cooling down from a 429 is skipped while a fallback
+    exists, and a rate limit or provider error moves the call to the next
+    entry. Only the last provider in a chain retries 429s itself, so
+    RateLimitExceeded still reaches callers once every provider is exhausted.
+    """
+
+    def __init__(self, tiers):
+        self.tiers = tiers
+
+    def has_tier(self, tier):
+        return bool(self.tiers.get(tier))
+
+    def _record(self, tier, provider, response, elapsed):
+        # A cache hit never reached the provider, so it costs nothing and its
+        # lookup time would drag the tier's latency down.
+        if (getattr(response, "response_metadata", None) or {}).get("cache_hit"):
+            metrics.incr(f"llm_{tier}_cache_hits")
+            return
+        usage = getattr(response, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        input_price, output_price = MODEL_PRICES.get(provider.model.split("/")[-1], (0.0, 0.0))
+        metrics.incr(f"llm_{tier}_calls")
+        metrics.incr(f"llm_{tier}_tokens", input_tokens + output_tokens)
+        metrics.incr(f"llm_{tier}_cost_usd", (input_tokens * input_price + output_tokens * output_price) / 1_000_000)
+        metrics.add_time(f"llm_{tier}_latency", elapsed)
+
+    def invoke(self, prompt, tier=FAST_TIER, **kwargs):
+        if not self.tiers.get(tier):
+            tier = FAST_TIER
+        chain = self.tiers[tier]
+        last_error = None
+
+        for position, (name, provider) in enumerate(chain):
+            has_fallback = position < len(chain) - 1
+            if has_fallback and provider.cooldown_remaining() > 0:
+                metrics.incr(f"llm_{tier}_failovers")
+                continue
+            started_at = time.monotonic()
+            try:
+                response = provider.invoke(prompt, **kwargs)
+            except Exception as e:
+                last_error = e
+                if not has_fallback:
+                    raise
+                reason = "rate limited" if isinstance(e, RateLimitExceeded) else str(e)[:50]
+                print(f"🔀 {name} failed ({reason}), failing over")
+                metrics.incr(f"llm_{tier}_failovers")
+                continue
+            self._record(tier, provider, response, time.monotonic() - started_at)
+            return response
+
+        raise last_error or RateLimitExceeded(f"Every {tier} LLM provider is cooling down")
+
+    def forget(self, prompt_version, cache_input, tier=FAST_TIER):
+        for _, provider in self.tiers.get(tier) or self.tiers[FAST_TIER]:
+            provider.forget(prompt_version, cache_input)
+
+    def prune(self):
+        # Every provider shares the llm_cache table.
+        _, provider = self.tiers[FAST_TIER][0]
+        return provider.prune()
+
+
+def build_router():
+    tiers = {}
+    for tier, spec in [(FAST_TIER, AgentConfig.LLM_FAST_MODELS), (STRONG_TIER, AgentConfig.LLM_STRONG_MODELS)]:
+        chain = parse_model_chain(spec)
+        tiers[tier] = [
+            (f"{provider}:{model}", build_provider(provider, model, AgentConfig.LLM_MAX_RETRIES if position == len(chain) - 1 else 0))
+            for position, (provider, model) in enumerate(chain)
+        ]
+    if not tiers[FAST_TIER]:
+        raise Exception("No LLM provider configured: set GROQ_API_KEY, OPENAI_API_KEY or GOOGLE_API_KEY for LLM_FAST_MODELS")
+    return LLMRouter(tiers)
+
+
+llm = build_router()
@@ -0,0 +1,115 @@
+import datetime
+import hashlib
+import re
+from langchain_core.messages import AIMessage
+from sqlalchemy import func, update
+from sqlmodel import Session, select, delete
+
+from .database import engine
+from .metrics import metrics
+from .models import LLMCacheEntry
+
+
+def normalize_text(text):
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def make_cache_key(model, prompt_version, cache_input):
+    payload = "\x1f".join([model, prompt_version, normalize_text(cache_input)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedLLM:
+    """Serves repeated prompts from the llm_cache table before calling the model.
+
+    Calls are cached only when the caller passes a ``prompt_version``; bump the
+    version whenever a prompt template changes so stale answers are not reused.
+    """
+
+    def __init__(self, llm, ttl_hours, max_entries, enabled=True):
+        self.llm = llm
+        self.enabled = enabled
+        self.ttl = datetime.timedelta(hours=ttl_hours)
+        self.max_entries = max_entries
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    @property
+    def model(self):
+        return getattr(self.llm, "model_name", None) or getattr(self.llm, "model", "unknown")
+
+    def _lookup(self, key):
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - self.ttl
+        with Session(engine) as session:
+            response = session.exec(
+                select(LLMCacheEntry.response).where(
+                    LLMCacheEntry.key == key, LLMCacheEntry.created_at >= cutoff
+                )
+            ).first()
+            if response is not None:
+                session.exec(
+                    update(LLMCacheEntry)
+                    .where(LLMCacheEntry.key == key)
+                    .values(hits=LLMCacheEntry.hits + 1, last_hit_at=datetime.datetime.now(datetime.timezone.utc))
+                )
+                session.commit()
+            return response
+
+    def _store(self, key, prompt_version, content):
+        with Session(engine) as session:
+            session.merge(LLMCacheEntry(
+                key=key, model=self.model, prompt_version=prompt_version, response=content
+            ))
+            session.commit()
+
+    def invoke(self, prompt, prompt_version=None, cache_input=None, **kwargs):
+        if not self.enabled or prompt_version is None:
+            return self.llm.invoke(prompt, **kwargs)
+
+        key = make_cache_key(self.model, prompt_version, cache_input if cache_input is not None else prompt)
+        try:
+            cached = self._lookup(key)
+        except Exception as e:
+            print(f"⚠️ LLM cache lookup failed: {str(e)[:50]}...")
+            cached = None
+
+        if cached is not None:
+            metrics.incr("llm_cache_hits")
+            return AIMessage(content=cached, response_metadata={"cache_hit": True})
+
+        metrics.incr("llm_cache_misses")
+        response = self.llm.invoke(prompt, **kwargs)
+        if response.content:
+            try:
+                self._store(key, prompt_version, response.content)
+            except Exception as e:
+                print(f"⚠️ LLM cache write failed: {str(e)[:50]}...")
+        return response
+
+    def forget(self, prompt_version, cache_input):
+        if not self.enabled:
+            return
+        key = make_cache_key(self.model, prompt_version, cache_input)
+        try:
+            with Session(engine) as session:
+                session.exec(delete(LLMCacheEntry).where(LLMCacheEntry.key == key))
+                session.commit()
+        except Exception as e:
+            print(f"⚠️ LLM cache invalidation failed: {str(e)[:50]}...")
+
+    def prune(self):
+        if not self.enabled:
+            return 0, 0
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - self.ttl
+        with Session(engine) as session:
+            expired = session.exec(delete(LLMCacheEntry).where(LLMCacheEntry.created_at < cutoff)).rowcount
+
+            overflow = session.exec(select(func.count()).select_from(LLMCacheEntry)).one() - self.max_entries
+            evicted = 0
+            if overflow > 0:
+                recency = func.coalesce(LLMCacheEntry.last_hit_at, LLMCacheEntry.created_at)
+                stale_keys = select(LLMCacheEntry.key).order_by(recency.asc()).limit(overflow)
+                evicted = session.exec(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(stale_keys))).rowcount
+            session.commit()
+        return expired, evicted
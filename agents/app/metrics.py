@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class RunMetrics:
+    """Thread-safe counters and timings for one agent run, printed by finalize_run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.counters = defaultdict(int)
+        self.timings = defaultdict(float)
+        self.stages = {}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            self.timings[name] += seconds
+
+    @contextmanager
+    def timer(self, name):
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.monotonic() - started_at)
+
+    def record_stage(self, name, stage_stats):
+        with self._lock:
+            self.stages[name] = stage_stats
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.monotonic()
+            self.counters.clear()
+            self.timings.clear()
+            self.stages.clear()
+
+    def print_summary(self):
+        print("📋 Run summary:")
+        print(f"   • Wall time: {time.monotonic() - self.started_at:.1f}s")
+        for name, stats in self.stages.items():
+            print(f"   • {name} stage: {stats.describe()}")
+        for name in sorted(self.counters):
+            value = self.counters[name]
+            print(f"   • {name.replace('_', ' ')}: {value:.4f}" if isinstance(value, float) else f"   • {name.replace('_', ' ')}: {value}")
+        for name in sorted(self.timings):
+            print(f"   • {name.replace('_', ' ')}: {self.timings[name]:.2f}s")
+
+
+metrics = RunMetrics()
@@ -1,6 +1,6 @@
 from typing import Optional, List, Dict
 from sqlmodel import Field, SQLModel
-from pydantic.v1 import BaseModel
+from pydantic import BaseModel, field_validator
 import datetime
 def get_utc_now():
     return datetime.datetime.now(datetime.UTC)
@@ -34,6 +34,7 @@ class Job(SQLModel, table=True):
     salary_range: Optional[str] = None
     company_info: Optional[str] = None
     tailored_suggestions: Optional[str] = None
+    profile_version: Optional[str] = None
 
 
 class Application(SQLModel, table=True):
@@ -65,7 +66,7 @@ class JobListings(BaseModel):
 
 class JobFitAnalysis(BaseModel):
     match_score: int = Field(..., ge=1, le=10, description="Match score 1-10")
-    match_summary: str = Field(..., description="Brief match summary")
+    match_summary: str = Field(default="Analysis completed", description="Brief match summary")
     matching_skills: List[str] = Field(
         default_factory=list, description="Matching skills"
     )
@@ -78,3 +79,75 @@ class JobFitAnalysis(BaseModel):
     company_info: Optional[Dict[str, str]] = Field(
         default=None, description="Company info"
     )
+
+    # Models return 7.5, "8" or {"employees": 500}; coerce rather than reject
+    # so a near-miss answer does not cost a second LLM call.
+    @field_validator("match_score", mode="before")
+    @classmethod
+    def round_score(cls, value):
+        if isinstance(value, str):
+            value = value.strip().split("/")[0]
+        try:
+            return min(max(round(float(value)), 1), 10)
+        except (TypeError, ValueError):
+            return value
+
+    @field_validator("match_summary", "salary_range", mode="before")
+    @classmethod
+    def stringify_text(cls, value):
+        return str(value) if isinstance(value, (int, float)) else value
+
+    @field_validator("matching_skills", "missing_skills", mode="before")
+    @classmethod
+    def skill_list(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [skill.strip() for skill in value.split(",") if skill.strip()]
+        if isinstance(value, list):
+            return [str(skill) for skill in value if skill is not None]
+        return value
+
+    @field_validator("company_info", mode="before")
+    @classmethod
+    def stringify_company_info(cls, value):
+        if not isinstance(value, dict):
+            return None
+        return {str(key): str(item) for key, item in value.items() if item is not None}
+
+
+class LLMCacheEntry(SQLModel, table=True):
+    __tablename__ = "llm_cache"
+    key: str = Field(primary_key=True)
+    model: str
+    prompt_version: str
+    response: str
+    created_at: datetime.datetime = Field(default_factory=get_utc_now, nullable=False, index=True)
+    last_hit_at: Optional[datetime.datetime] = Field(default=None, index=True)
+    hits: int = Field(default=0)
+
+
+class SiteLinkPattern(SQLModel, table=True):
+    __tablename__ = "site_link_patterns"
+    domain: str = Field(primary_key=True)
+    job_url_pattern: str
+    next_page_pattern: Optional[str] = None
+    successes: int = Field(default=0)
+    updated_at: datetime.datetime = Field(default_factory=get_utc_now, nullable=False)
+
+
+class PageFingerprint(SQLModel, table=True):
+    __tablename__ = "page_fingerprints"
+    url: str = Field(primary_key=True)
+    fingerprint: str
+    link_count: int = Field(default=0)
+    updated_at: datetime.datetime = Field(default_factory=get_utc_now, nullable=False)
+
+
+class DomainFetchMode(SQLModel, table=True):
+    __tablename__ = "domain_fetch_modes"
+    domain: str = Field(primary_key=True)
+    mode: str
+    http_successes: int = Field(default=0)
+    escalations: int = Field(default=0)
+    updated_at: datetime.datetime = Field(default_factory=get_utc_now, nullable=False)
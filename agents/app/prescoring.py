@@ -0,0 +1,194 @@
+import datetime
+import json
+import math
+import re
+import threading
+from collections import Counter
+from sqlmodel import Session, select
+
+from .config import AgentConfig
+from .database import engine
+from .models import Job
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have in is it its of on or our that the their this to we will with"
+    " you your who what work working team teams role job position company candidate candidates experience years"
+    " ability strong including within across using use help".split()
+)
+
+SENIOR_TITLE_PATTERN = re.compile(r"\b(?:senior|sr\.?|lead|principal|staff|head of|director|manager|vp|architect)\b", re.IGNORECASE)
+REQUIRED_YEARS_PATTERN = re.compile(
+    r"(?:at least|minimum(?: of)?|min\.?)?\s*(\d{1,2})\s*(?:\+|plus|or more)?\s*(?:-|to)?\s*(?:\d{1,2})?\s*\+?\s*years?"
+    r"\s+(?:of\s+)?(?:[\w/-]+\s+){0,4}?experience",
+    re.IGNORECASE,
+)
+PHD_REQUIRED_PATTERN = re.compile(r"ph\.?d\.?\s+(?:is\s+)?required|require[sd]?\s+(?:a\s+)?ph\.?d", re.IGNORECASE)
+CANDIDATE_YEARS_PATTERN = re.compile(r"(\d{1,2})\s*\+?\s*years?", re.IGNORECASE)
+# "Mar 2020 - Present", "2016 to 2018", "Jun 2018 – Feb 2020"
+ROLE_SPAN_PATTERN = re.compile(
+    r"((?:19|20)\d{2})\s*(?:-|–|—|to)\s*(?:[a-z]+\.?\s+)?((?:19|20)\d{2}|present|current|now|date)",
+    re.IGNORECASE,
+)
+
+# Scores the rules cap a job at; below the default PRESCORE_THRESHOLD so they skip the LLM.
+SENIOR_TITLE_CAP = 2
+YEARS_GAP_CAP = 2
+PHD_CAP = 2
+YEARS_GAP_LIMIT = 4
+SENIOR_CANDIDATE_YEARS = 5
+# Profile skills found in the posting that count as full skill coverage.
+SKILL_MATCH_TARGET = 3
+# TF-IDF cosine similarity that counts as full topical overlap.
+SIMILARITY_TARGET = 0.3
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS and len(token) > 1]
+
+
+def split_skills(skills):
+    # populate_profile.py stores skills as a JSON list; hand-edited profiles use commas.
+    try:
+        parsed = json.loads(skills or "")
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, list):
+        return [str(skill).strip() for skill in parsed if str(skill).strip()]
+    return [skill.strip() for skill in re.split(r"[,;\n]", skills or "") if skill.strip()]
+
+
+def mentions(skill, text_lower):
+    # Word boundaries that still work for skills like "C++", "C#" and "Node.js".
+    return re.search(rf"(?<![\w+#]){re.escape(skill.lower())}(?![\w+#])", text_lower) is not None
+
+
+def required_years(text):
+    years = [int(match.group(1)) for match in REQUIRED_YEARS_PATTERN.finditer(text or "")]
+    years = [value for value in years if 0 < value <= 15]
+    return max(years) if years else 0
+
+
+def candidate_years(user_profile):
+    """Stated "N years" or the summed span of dated roles, whichever is larger."""
+    experience = user_profile.get("experience") or ""
+    stated = [int(value) for value in CANDIDATE_YEARS_PATTERN.findall(experience)]
+    stated = [value for value in stated if value <= 40]
+
+    current_year = datetime.date.today().year
+    spans = 0
+    for start, end in ROLE_SPAN_PATTERN.findall(experience):
+        end_year = int(end) if end.isdigit() else current_year
+        spans += max(0, end_year - int(start))
+    return max(stated + [min(spans, 40)])
+
+
+class LocalPrescorer:
+    """Keyword rules plus TF-IDF similarity against the profile, cheap enough
+    to run on every fetched job before it is queued for the LLM.
+
+    Document frequencies are seeded from stored job descriptions and grow with
+    every job scored in the run, so common boilerplate terms ("benefits",
+    "apply") weigh little and skill terms weigh a lot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._document_frequency = Counter()
+        self._documents = 0
+        self._profile_key = None
+        self._profile_terms = Counter()
+        self.loaded = False
+
+    def load(self):
+        documents = Counter()
+        count = 0
+        with Session(engine) as session:
+            statement = (
+                select(Job.raw_description)
+                .where(Job.raw_description.is_not(None))
+                .order_by(Job.date_found.desc())
+                .limit(AgentConfig.PRESCORE_IDF_SAMPLE)
+            )
+            for description in session.exec(statement):
+                documents.update(set(tokenize(description)))
+                count += 1
+        with self._lock:
+            self._document_frequency = documents
+            self._documents = count
+            self.loaded = True
+        return count
+
+    def _observe(self, terms):
+        with self._lock:
+            self._document_frequency.update(terms.keys())
+            self._documents += 1
+
+    def _weights(self, terms):
+        with self._lock:
+            total = self._documents
+            weights = {
+                term: (1 + math.log(count)) * (math.log((1 + total) / (1 + self._document_frequency[term])) + 1)
+                for term, count in terms.items()
+            }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return weights, norm
+
+    def _profile(self, user_profile):
+        key = tuple(user_profile.get(field) for field in ("skills", "summary", "projects", "experience"))
+        with self._lock:
+            if key == self._profile_key:
+                return self._profile_terms
+        skills_text = " ".join(split_skills(user_profile.get("skills")))
+        # Skills are the strongest signal, so they count twice.
+        terms = Counter(tokenize(" ".join([skills_text, skills_text, *(part or "" for part in key[1:])])))
+        with self._lock:
+            self._profile_key = key
+            self._profile_terms = terms
+        return terms
+
+    def similarity(self, profile_terms, job_terms):
+        profile_weights, profile_norm = self._weights(profile_terms)
+        job_weights, job_norm = self._weights(job_terms)
+        if not profile_norm or not job_norm:
+            return 0.0
+        dot = sum(weight * job_weights[term] for term, weight in profile_weights.items() if term in job_weights)
+        return dot / (profile_norm * job_norm)
+
+    def analyze(self, user_profile, title, job_description):
+        """Return analysis fields (match_score 1-10, reasons, matching_skills)."""
+        text = f"{title or ''}\n{job_description or ''}"
+        text_lower = text.lower()
+        job_terms = Counter(tokenize(text))
+        self._observe(job_terms)
+
+        skills = split_skills(user_profile.get("skills"))
+        matching_skills = [skill for skill in skills if mentions(skill, text_lower)]
+        similarity = self.similarity(self._profile(user_profile), job_terms)
+
+        coverage = min(1.0, len(matching_skills) / min(SKILL_MATCH_TARGET, len(skills))) if skills else 0.0
+        fit = 0.5 * coverage + 0.5 * min(1.0, similarity / SIMILARITY_TARGET)
+        match_score = 1 + round(fit * 8)
+        reasons = [f"{len(matching_skills)} skill matches, similarity {similarity:.2f}"]
+
+        experience = candidate_years(user_profile)
+        if experience < SENIOR_CANDIDATE_YEARS and SENIOR_TITLE_PATTERN.search(title or ""):
+            match_score = min(match_score, SENIOR_TITLE_CAP)
+            reasons.append("senior-level title")
+        required = required_years(job_description)
+        if required - experience >= YEARS_GAP_LIMIT:
+            match_score = min(match_score, YEARS_GAP_CAP)
+            reasons.append(f"requires {required}+ years")
+        if PHD_REQUIRED_PATTERN.search(job_description or ""):
+            match_score = min(match_score, PHD_CAP)
+            reasons.append("requires a PhD")
+
+        return {
+            "match_score": match_score,
+            "reasons": reasons,
+            "matching_skills": matching_skills,
+            "similarity": similarity,
+        }
+
+
+prescorer = LocalPrescorer()
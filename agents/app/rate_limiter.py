@@ -0,0 +1,154 @@
+import re
+import threading
+import time
+
+from .metrics import metrics
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def is_rate_limit_error(error):
+    if isinstance(error, RateLimitExceeded):
+        return True
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "rate limit" in message or "429" in message
+
+
+def get_retry_after(error):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    # Groq also spells it out in the message: "Please try again in 7.52s"
+    match = re.search(r"try again in (?:(\d+)m)?([\d.]+)s", str(error))
+    if match:
+        return int(match.group(1) or 0) * 60 + float(match.group(2))
+    return None
+
+
+class TokenBucket:
+    """Reservation-based bucket: callers take what they need and sleep off any deficit."""
+
+    def __init__(self, per_minute):
+        self._lock = threading.Lock()
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_per_minute(self, per_minute):
+        with self._lock:
+            self._refill()
+            self.rate = per_minute / 60.0
+
+    def reserve(self, amount):
+        with self._lock:
+            self._refill()
+            self.available -= min(amount, self.capacity)
+            if self.available >= 0:
+                return 0.0
+            return -self.available / self.rate
+
+    def adjust(self, amount):
+        with self._lock:
+            self._refill()
+            self.available -= amount
+
+
+class RateLimitedLLM:
+    """Wraps a chat model with requests/minute and tokens/minute budgets.
+
+    On a 429 every caller pauses for the server's Retry-After, the request rate
+    is halved and the call is retried; the rate recovers gradually on success.
+    RateLimitExceeded is raised only once ``max_retries`` is exhausted so the
+    caller can re-queue the work.
+    """
+
+    def __init__(self, llm, requests_per_minute, tokens_per_minute, max_retries=3,
+                 expected_output_tokens=500):
+        self.llm = llm
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.expected_output_tokens = expected_output_tokens
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._rate_scale = 1.0
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def _wait_for_budget(self, tokens):
+        wait = max(self.cooldown_remaining(), self.requests.reserve(1), self.tokens.reserve(tokens))
+        if wait > 0:
+            metrics.add_time("llm_rate_limit_wait", wait)
+            time.sleep(wait)
+
+    def cooldown_remaining(self):
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    def _throttle(self, retry_after, attempt):
+        delay = retry_after if retry_after is not None else min(60.0, 5.0 * 2 ** attempt)
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._rate_scale = max(0.25, self._rate_scale * 0.5)
+            self.requests.set_per_minute(self.requests_per_minute * self._rate_scale)
+        print(f"⏸️ LLM rate limited, backing off {delay:.1f}s")
+
+    def _recover(self):
+        with self._lock:
+            if self._rate_scale < 1.0:
+                self._rate_scale = min(1.0, self._rate_scale + 0.05)
+                self.requests.set_per_minute(self.requests_per_minute * self._rate_scale)
+
+    def invoke(self, prompt, **kwargs):
+        estimated = estimate_tokens(prompt) + self.expected_output_tokens
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_budget(estimated)
+            metrics.incr("llm_requests")
+            try:
+                response = self.llm.invoke(prompt, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                metrics.incr("llm_rate_limited")
+                last_error = e
+                self._throttle(get_retry_after(e), attempt)
+                continue
+
+            usage = getattr(response, "usage_metadata", None) or {}
+            if usage.get("total_tokens"):
+                self.tokens.adjust(usage["total_tokens"] - estimated)
+            self._recover()
+            return response
+
+        raise RateLimitExceeded(
+            f"LLM still rate limited after {self.max_retries + 1} attempts: {str(last_error)[:50]}",
+            retry_after=get_retry_after(last_error),
+        )
@@ -0,0 +1,125 @@
+import json
+import threading
+from sqlalchemy import case, or_
+from sqlmodel import Session, select
+
+from .config import AgentConfig
+from .database import engine
+from .models import Job, UserProfile
+from .metrics import metrics
+from .prescoring import prescorer
+from .agent_nodes import analyze_jobs, profile_version
+
+# Columns a re-score rewrites; status, notes and the stored description are left alone.
+# An empty value means the new analysis did not produce that field (prefiltered
+# jobs have no missing_skills), so the stored one is kept.
+RESCORED_FIELDS = ("match_score", "match_summary", "matching_skills", "missing_skills", "profile_version")
+EMPTY_VALUES = (None, "", "[]", "{}")
+
+
+def rescore_statuses():
+    return [status.strip() for status in AgentConfig.RESCORE_STATUSES.split(",") if status.strip()]
+
+
+def find_stale_jobs(session, version, limit):
+    """Jobs scored against another profile version, active statuses first
+    (in RESCORE_STATUSES order) and every other status after them, most
+    recently found first within a status."""
+    statuses = rescore_statuses()
+    priority = case({status: rank for rank, status in enumerate(statuses)}, value=Job.status, else_=len(statuses))
+    statement = (
+        select(Job)
+        .where(
+            Job.raw_description.is_not(None),
+            or_(Job.profile_version.is_(None), Job.profile_version != version),
+        )
+        .order_by(priority, Job.date_found.desc())
+        .limit(limit)
+    )
+    return session.exec(statement).all()
+
+
+def load_company_info(value):
+    try:
+        company_info = json.loads(value) if value else {}
+    except json.JSONDecodeError:
+        return {}
+    return company_info if isinstance(company_info, dict) else {}
+
+
+def stored_job(job):
+    """Rebuild the fetch_job_page shape from a stored row, so nothing is re-fetched."""
+    company_info = load_company_info(job.company_info)
+    return {
+        "url": job.url,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "description": job.raw_description,
+        "date_posted": company_info.get("date_posted"),
+    }
+
+
+def apply_rescore(row, job):
+    for field in RESCORED_FIELDS:
+        value = getattr(job, field)
+        if value not in EMPTY_VALUES:
+            setattr(row, field, value)
+    # Keys from the new analysis win; the rest of what was stored is kept.
+    company_info = {**load_company_info(row.company_info), **load_company_info(job.company_info)}
+    row.company_info = json.dumps(company_info) if company_info else None
+    row.salary_range = job.salary_range or row.salary_range
+
+
+def rescore_jobs(limit=None):
+    print("🔁 Re-scoring stored jobs against the current profile")
+    metrics.reset()
+
+    with Session(engine) as session:
+        profile = session.exec(select(UserProfile)).first()
+        if not profile:
+            print("❌ User profile not found in database")
+            return None
+        user_profile = profile.model_dump()
+        version = profile_version(user_profile)
+        stale = find_stale_jobs(session, version, limit or AgentConfig.RESCORE_MAX_JOBS)
+        job_ids = [job.id for job in stale]
+        items = [(index, stored_job(job)) for index, job in enumerate(stale)]
+
+    if not items:
+        print(f"✅ Every stored job is already scored against profile {version}")
+        return {"rescored": 0, "profile_version": version}
+
+    if AgentConfig.PRESCORE_ENABLED:
+        try:
+            prescorer.load()
+        except Exception as e:
+            print(f"⚠️ Pre-scorer seed failed: {str(e)[:50]}...")
+
+    print(f"🔍 Re-scoring {len(items)} jobs against profile {version}")
+    write_lock = threading.Lock()
+    updated = []
+
+    def store(index, job):
+        with write_lock:
+            try:
+                with Session(engine) as session:
+                    row = session.get(Job, job_ids[index])
+                    if row is None:
+                        return
+                    apply_rescore(row, job)
+                    session.add(row)
+                    session.commit()
+                    updated.append(row.id)
+            except Exception as e:
+                print(f"❌ Re-score save failed: {str(e)[:50]}...")
+
+    score_counts, prefiltered, _, score_stats, _ = analyze_jobs(
+        user_profile, items, lambda item: item, store, loaders=1,
+    )
+
+    metrics.record_stage("rescore", score_stats)
+    print(f"✅ Re-scored {len(updated)}/{len(items)} jobs ({prefiltered} prefiltered without the LLM)")
+    print(f"📊 Score distribution: {score_counts['high']} high (7+), {score_counts['medium']} medium (5-6), {score_counts['low']} low (<5)")
+    metrics.print_summary()
+    return {"rescored": len(updated), "prefiltered": prefiltered, "profile_version": version, **score_counts}
@@ -0,0 +1,155 @@
+import threading
+from collections import defaultdict
+
+from .config import AgentConfig
+from .link_extractor import get_domain
+
+# Rough transfer sizes used to estimate what an aborted request would have cost.
+TYPICAL_RESOURCE_BYTES = {
+    "image": 45_000,
+    "media": 500_000,
+    "font": 35_000,
+    "stylesheet": 25_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_RESOURCE_BYTES = 10_000
+
+# Analytics, ad and session-replay hosts that never contribute job content.
+DEFAULT_BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "ads.linkedin.com",
+    "newrelic.com",
+    "nr-data.net",
+    "optimizely.com",
+    "onetrust.com",
+    "cookielaw.org",
+]
+
+
+def split_list(value):
+    return [item.strip().lower() for item in (value or "").split(",") if item.strip()]
+
+
+def matches_domain(domain, patterns):
+    return any(domain == pattern or domain.endswith("." + pattern) for pattern in patterns)
+
+
+class ResourceBlocker:
+    """Aborts requests the agent never reads (images, fonts, trackers...) via
+    Playwright route interception.
+
+    Rules are checked in order: documents always load, ``bypass`` sites load
+    everything (for career pages that break without their assets), ``allow``
+    domains always load, ``block`` domains never load, and everything else is
+    blocked by resource type.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = AgentConfig.BLOCK_RESOURCES
+        self.sites = defaultdict(lambda: {
+            "pages": 0,
+            "blocked": 0,
+            "bytes_saved": 0,
+            "bytes_loaded": 0,
+            "load_seconds": 0.0,
+        })
+        self.configure({})
+
+    def configure(self, resource_blocking):
+        """Combine the env defaults with ``resource_blocking`` from config.json."""
+        resource_blocking = resource_blocking or {}
+        self.blocked_types = set(split_list(AgentConfig.BLOCK_RESOURCE_TYPES))
+        if "types" in resource_blocking:
+            self.blocked_types = {t.lower() for t in resource_blocking["types"]}
+        self.blocked_domains = (DEFAULT_BLOCKED_DOMAINS + split_list(AgentConfig.BLOCK_DOMAINS)
+                                + [d.lower() for d in resource_blocking.get("block", [])])
+        self.allowed_domains = split_list(AgentConfig.ALLOW_DOMAINS) + [d.lower() for d in resource_blocking.get("allow", [])]
+        self.bypass_sites = [get_domain(f"//{d}") for d in split_list(AgentConfig.BLOCK_BYPASS_SITES) + resource_blocking.get("bypass", [])]
+
+    def should_block(self, site, resource_type, request_url):
+        if not self.enabled or resource_type == "document":
+            return False
+        if matches_domain(site, self.bypass_sites):
+            return False
+        domain = get_domain(request_url)
+        if matches_domain(domain, self.allowed_domains):
+            return False
+        if matches_domain(domain, self.blocked_domains):
+            return True
+        return resource_type in self.blocked_types
+
+    def attach(self, page):
+        if not self.enabled:
+            return
+
+        def handle(route):
+            request = route.request
+            site = get_domain(page.url)
+            if self.should_block(site, request.resource_type, request.url):
+                with self._lock:
+                    stats = self.sites[site]
+                    stats["blocked"] += 1
+                    stats["bytes_saved"] += TYPICAL_RESOURCE_BYTES.get(request.resource_type, DEFAULT_RESOURCE_BYTES)
+                route.abort("blockedbyclient")
+            else:
+                route.continue_()
+
+        def on_response(response):
+            try:
+                size = int(response.headers.get("content-length") or 0)
+            except ValueError:
+                size = 0
+            if size:
+                with self._lock:
+                    self.sites[get_domain(page.url)]["bytes_loaded"] += size
+
+        page.route("**/*", handle)
+        page.on("response", on_response)
+
+    def record_load(self, url, seconds):
+        with self._lock:
+            stats = self.sites[get_domain(url)]
+            stats["pages"] += 1
+            stats["load_seconds"] += seconds
+
+    def reset(self):
+        with self._lock:
+            self.sites.clear()
+
+    def print_report(self):
+        if not self.enabled or not self.sites:
+            return
+        print("🚫 Resource blocking (savings are estimates, not measurements):")
+        for site, stats in sorted(self.sites.items(), key=lambda item: -item[1]["bytes_saved"]):
+            if not stats["pages"]:
+                continue
+            # Time saved assumes blocked bytes would have arrived at the rate
+            # the allowed ones did.
+            throughput = stats["bytes_loaded"] / stats["load_seconds"] if stats["load_seconds"] else 0
+            seconds_saved = stats["bytes_saved"] / throughput if throughput else 0.0
+            print(
+                f"   • {site}: {stats['blocked']} requests blocked over {stats['pages']} pages "
+                f"(avg load {stats['load_seconds'] / stats['pages']:.1f}s measured); "
+                f"est. ~{stats['bytes_saved'] / 1_000_000:.1f} MB and ~{seconds_saved:.1f}s saved"
+            )
+        print("   ℹ️ MB saved uses typical sizes per resource type; time saved assumes those bytes "
+              "would have arrived at the page's content-length / load-time rate")
+
+
+resource_blocker = ResourceBlocker()
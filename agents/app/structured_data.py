@@ -0,0 +1,122 @@
+import json
+import re
+
+# Keys schema.org publishers use for the salary period, normalised for display.
+SALARY_UNITS = {"HOUR": "hour", "DAY": "day", "WEEK": "week", "MONTH": "month", "YEAR": "year"}
+
+
+def load_json_ld(block):
+    block = re.sub(r"^\s*(?://)?\s*<!\[CDATA\[|\]\]>\s*$", "", block or "").strip()
+    if not block:
+        return None
+    try:
+        return json.loads(block, strict=False)
+    except json.JSONDecodeError:
+        return None
+
+
+def iter_nodes(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from iter_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from iter_nodes(data["@graph"])
+
+
+def is_job_posting(node):
+    node_type = node.get("@type")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return any(isinstance(t, str) and t.split("/")[-1] == "JobPosting" for t in types)
+
+
+def find_job_posting(blocks):
+    for block in blocks or []:
+        for node in iter_nodes(load_json_ld(block)):
+            if is_job_posting(node):
+                return node
+    return None
+
+
+def name_of(value):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("name")
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def format_location(posting):
+    places = posting.get("jobLocation") or []
+    if not isinstance(places, list):
+        places = [places]
+
+    locations = []
+    for place in places:
+        address = place.get("address") if isinstance(place, dict) else place
+        if isinstance(address, str):
+            parts = [address]
+        elif isinstance(address, dict):
+            parts = [
+                name_of(address.get("addressLocality")) or address.get("addressLocality"),
+                name_of(address.get("addressRegion")) or address.get("addressRegion"),
+                name_of(address.get("addressCountry")) or address.get("addressCountry"),
+            ]
+        else:
+            parts = [name_of(place)]
+        location = ", ".join(part.strip() for part in parts if isinstance(part, str) and part.strip())
+        if location and location not in locations:
+            locations.append(location)
+
+    if str(posting.get("jobLocationType", "")).upper() == "TELECOMMUTE":
+        locations.append("Remote")
+    return "; ".join(locations) or None
+
+
+def format_salary(posting):
+    salary = posting.get("baseSalary") or posting.get("estimatedSalary")
+    if isinstance(salary, list):
+        salary = salary[0] if salary else None
+    if isinstance(salary, (int, float, str)):
+        return str(salary)
+    if not isinstance(salary, dict):
+        return None
+
+    currency = salary.get("currency") or salary.get("salaryCurrency") or ""
+    value = salary.get("value")
+    unit = None
+    if isinstance(value, dict):
+        unit = value.get("unitText")
+        low, high = value.get("minValue"), value.get("maxValue")
+        single = value.get("value")
+    else:
+        low = high = None
+        single = value
+    unit = SALARY_UNITS.get(str(unit or salary.get("unitText") or "").upper())
+
+    def amount(number):
+        try:
+            return f"{float(number):,.0f}"
+        except (TypeError, ValueError):
+            return str(number)
+
+    if low is not None and high is not None and low != high:
+        text = f"{amount(low)}-{amount(high)}"
+    elif low is not None or high is not None or single is not None:
+        text = amount(next(v for v in (low, high, single) if v is not None))
+    else:
+        return None
+    return " ".join(filter(None, [text, currency, f"per {unit}" if unit else None]))
+
+
+def job_posting_fields(posting):
+    """Map a schema.org JobPosting onto Job fields; ``description`` stays HTML."""
+    return {
+        "title": name_of(posting.get("title")),
+        "company": name_of(posting.get("hiringOrganization")),
+        "location": format_location(posting),
+        "salary_range": format_salary(posting),
+        "date_posted": posting.get("datePosted") if isinstance(posting.get("datePosted"), str) else None,
+        "description": posting.get("description") if isinstance(posting.get("description"), str) else None,
+    }
@@ -0,0 +1,230 @@
+"""Replay the full agent graph offline and report throughput.
+
+    python benchmarks/agent_replay.py [--crawl-mode concurrent] [--batch-size 4]
+                                      [--llm-latency 300] [--repeat 3] [--no-browser]
+                                      [--json results.json]
+
+The compiled ``app.graph.app`` runs against benchmarks/fixtures/replay served
+by stub_server (a two-page careers listing plus a Greenhouse board pointing
+at the same twelve job pages), with a deterministic fake LLM in place of the
+model router and an in-memory SQLite database. Listing pages still go
+through Playwright, including the agent's politeness delays; ``--no-browser``
+drops the listing target so only the ATS board and HTTP detail fetches run.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from langchain_core.messages import AIMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import FIXTURES_DIR, start_stub_server
+
+REPLAY_PROFILE = {
+    "full_name": "Replay Candidate",
+    "summary": "Computer science graduate building backend services and web apps",
+    "experience": "Software engineering intern, Jun 2025 - Dec 2025",
+    "education": "Bachelor of Technology in Computer Science",
+    "projects": "Flask REST API with PostgreSQL; React dashboard for campus events",
+    "skills": "Python, SQL, JavaScript, React, Git, Docker, REST APIs",
+}
+
+
+class FakeLLM:
+    """Stands in for the LLM router: answers every prompt the agent sends
+    from the prompt itself, after a fixed delay, and counts calls by kind."""
+
+    def __init__(self, latency_seconds, url_prompt_version, batch_prompt_version):
+        self.latency = latency_seconds
+        self.url_prompt_version = url_prompt_version
+        self.batch_prompt_version = batch_prompt_version
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def has_tier(self, tier):
+        return True
+
+    def forget(self, prompt_version, cache_input, tier=None):
+        pass
+
+    def prune(self):
+        return 0, 0
+
+    def _score(self, text):
+        return 1 + int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16) % 10
+
+    def _analysis(self, text):
+        return {
+            "match_score": self._score(text),
+            "match_summary": "Replay analysis",
+            "matching_skills": ["Python"],
+            "missing_skills": [],
+        }
+
+    def invoke(self, prompt, tier="fast", prompt_version=None, cache_input=None, **kwargs):
+        kind = {self.url_prompt_version: "url_extraction", self.batch_prompt_version: "batch_scoring"}.get(prompt_version, "scoring")
+        with self._lock:
+            self.calls[f"{tier}:{kind}"] += 1
+        time.sleep(self.latency)
+
+        if kind == "url_extraction":
+            links = re.findall(r"^(.*?) \| (\S+)$", prompt, re.MULTILINE)
+            content = {
+                "job_urls": [url for _, url in links if "/jobs/" in url],
+                "next_page_url": next((url for text, url in links if "next" in text.lower()), None),
+            }
+        elif kind == "batch_scoring":
+            blocks = re.split(r"JOB ID: (job-\d+)\n", prompt)[1:]
+            content = {
+                "results": [
+                    {"job_id": job_id, **self._analysis(block)}
+                    for job_id, block in zip(blocks[::2], blocks[1::2])
+                ]
+            }
+        else:
+            content = self._analysis(cache_input or prompt)
+        return AIMessage(content=json.dumps(content))
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crawl-mode", choices=["sequential", "concurrent"], default="sequential")
+    parser.add_argument("--batch-size", type=int, help="SCORING_BATCH_SIZE for the run")
+    parser.add_argument("--llm-latency", type=float, default=200, help="fake LLM latency per call in ms")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-browser", action="store_true", help="skip the Playwright listing target")
+    parser.add_argument("--json", metavar="PATH", help="write per-run results to PATH")
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    # AgentConfig and the database engine read the environment at import time,
+    # so everything is set before the first app import. DATABASE_URL is forced
+    # so a .env pointing at a real database is never touched.
+    os.environ["DATABASE_URL"] = "sqlite://"
+    os.environ.setdefault("GROQ_API_KEY", "replay")
+    os.environ["CRAWL_MODE"] = args.crawl_mode
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["CHECKPOINT_ENABLED"] = "false"
+    if args.batch_size:
+        os.environ["SCORING_BATCH_SIZE"] = str(args.batch_size)
+
+
+def write_config(base_url, no_browser):
+    targets = [] if no_browser else [f"{base_url}/replay/careers/"]
+    targets.append({"ats": "greenhouse", "board": "replay", "company": "Replay Labs", "base_url": f"{base_url}/replay/greenhouse"})
+    with open("config.json", "w") as f:
+        json.dump({"target_urls": targets}, f, indent=2)
+
+
+def reset_database():
+    from sqlmodel import Session, SQLModel
+    from app.database import engine
+    from app.models import UserProfile
+
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(UserProfile(**REPLAY_PROFILE))
+        session.commit()
+
+
+def replay_once(fake_llm):
+    from app.graph import app
+    from app.metrics import metrics
+
+    reset_database()
+    fake_llm.calls.clear()
+    node_seconds = defaultdict(float)
+    analysis_stats = {}
+
+    started_at = time.monotonic()
+    step_started_at = started_at
+    for update in app.stream({}, config={"recursion_limit": 200}, stream_mode="updates"):
+        now = time.monotonic()
+        for node, state in update.items():
+            node_seconds[node] += now - step_started_at
+            if node == "deep_job_analysis" and state:
+                analysis_stats = state.get("analysis_stats") or {}
+        step_started_at = now
+    wall = time.monotonic() - started_at
+
+    fetch_stage = metrics.stages.get("fetch")
+    detail_pages = fetch_stage.items if fetch_stage else 0
+    # Counted at extraction so sequential and concurrent crawls report the same way.
+    listing_pages = metrics.counters.get("pages_extracted_from_dom", 0) + metrics.counters.get("pages_extracted_by_llm", 0)
+    analyzed = analysis_stats.get("analyzed", 0)
+    analysis_seconds = node_seconds.get("deep_job_analysis", 0.0)
+
+    return {
+        "wall_seconds": round(wall, 3),
+        "listing_pages": listing_pages,
+        "detail_pages": detail_pages,
+        "pages_per_second": round((listing_pages + detail_pages) / wall, 3) if wall else 0.0,
+        "jobs_analyzed": analyzed,
+        "jobs_prefiltered": analysis_stats.get("prefiltered", 0),
+        "jobs_per_second": round(analyzed / analysis_seconds, 3) if analysis_seconds else 0.0,
+        "llm_calls": dict(fake_llm.calls),
+        "llm_calls_per_job": round(fake_llm.total_calls / analyzed, 3) if analyzed else 0.0,
+        "node_seconds": {node: round(seconds, 3) for node, seconds in node_seconds.items()},
+        # ru_maxrss is in KB on Linux; it is the process peak, so it never drops between repeats.
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def print_result(number, result):
+    print(f"\n📋 Replay run {number}:")
+    print(f"   • Wall time: {result['wall_seconds']:.2f}s")
+    print(f"   • Pages: {result['listing_pages']} listing + {result['detail_pages']} detail ({result['pages_per_second']:.2f}/s)")
+    print(f"   • Jobs analyzed: {result['jobs_analyzed']} ({result['jobs_prefiltered']} prefiltered, {result['jobs_per_second']:.2f}/s in deep analysis)")
+    print(f"   • LLM calls per job: {result['llm_calls_per_job']:.2f} {result['llm_calls']}")
+    print(f"   • Peak RSS: {result['peak_rss_mb']:.1f} MB")
+    for node, seconds in sorted(result["node_seconds"].items(), key=lambda pair: -pair[1]):
+        print(f"   • {node}: {seconds:.2f}s")
+
+
+def main():
+    args = parse_args()
+    configure_environment(args)
+
+    from app import agent_nodes
+
+    server, base_url = start_stub_server(FIXTURES_DIR)
+    fake_llm = FakeLLM(args.llm_latency / 1000, agent_nodes.URL_EXTRACTION_PROMPT_VERSION, agent_nodes.JOB_BATCH_PROMPT_VERSION)
+    agent_nodes.llm = fake_llm
+    print(f"🧪 Replaying fixtures from {base_url} ({args.crawl_mode} crawl, {args.llm_latency:.0f}ms fake LLM)")
+
+    results = []
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            write_config(base_url, args.no_browser)
+            for number in range(1, args.repeat + 1):
+                result = replay_once(fake_llm)
+                results.append(result)
+                print_result(number, result)
+        finally:
+            os.chdir(previous_dir)
+            server.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "runs": results}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Compare HTML-to-text backends on recorded pages.
+
+    python benchmarks/html_to_text.py --record https://careers.example.com/jobs ...
+    python benchmarks/html_to_text.py [pages...] [--repeat 5] [--browser]
+
+Pages default to benchmarks/pages/*.html. Output agreement is measured
+against the bs4 backend, which is what the agent used before backends were
+pluggable.
+"""
+import argparse
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.html_text import (
+    PARSERS,
+    LISTING_DROP_TAGS,
+    BROWSER_EXTRACT_JS,
+    COMPANY_SELECTORS,
+    backend_available,
+    parse_bs4,
+)
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+
+def record(urls):
+    from app.browser_pool import get_browser_pool, shutdown_browser_pool
+
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    try:
+        for url in urls:
+            with get_browser_pool().page() as page:
+                page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                page.wait_for_timeout(3000)
+                html = page.content()
+            name = re.sub(r"[^A-Za-z0-9]+", "_", url.split("://", 1)[-1]).strip("_")[:80]
+            path = os.path.join(PAGES_DIR, f"{name}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+            print(f"💾 {url} -> {path} ({len(html) / 1000:.0f} KB)")
+    finally:
+        shutdown_browser_pool()
+
+
+def line_overlap(text, reference):
+    lines, reference_lines = set(text.splitlines()), set(reference.splitlines())
+    if not lines and not reference_lines:
+        return 1.0
+    return len(lines & reference_lines) / len(lines | reference_lines)
+
+
+def time_backend(parse, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        document = parse(html, "https://example.com/", LISTING_DROP_TAGS)
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings), document
+
+
+def time_browser(pages, repeat):
+    """Time page.content() + bs4 against in-page innerText on the same DOM."""
+    from app.browser_pool import get_browser_pool, shutdown_browser_pool
+
+    results = {"bs4 (page.content)": [], "browser": []}
+    try:
+        with get_browser_pool().page() as page:
+            for html in pages:
+                for _ in range(repeat):
+                    page.set_content(html, wait_until="domcontentloaded")
+                    started_at = time.perf_counter()
+                    parse_bs4(page.content(), "https://example.com/", LISTING_DROP_TAGS)
+                    results["bs4 (page.content)"].append(time.perf_counter() - started_at)
+
+                    page.set_content(html, wait_until="domcontentloaded")
+                    started_at = time.perf_counter()
+                    page.evaluate(BROWSER_EXTRACT_JS, [LISTING_DROP_TAGS, COMPANY_SELECTORS])
+                    results["browser"].append(time.perf_counter() - started_at)
+    finally:
+        shutdown_browser_pool()
+    return {name: statistics.median(timings) for name, timings in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="HTML files (default: benchmarks/pages/*.html)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--browser", action="store_true", help="also time in-browser innerText extraction")
+    parser.add_argument("--record", nargs="+", metavar="URL", help="save rendered pages to benchmarks/pages/")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    paths = args.pages or sorted(glob.glob(os.path.join(PAGES_DIR, "*.html")))
+    if not paths:
+        print("❌ No pages to benchmark; record some with --record URL")
+        return
+
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    total_mb = sum(len(html) for html in pages) / 1_000_000
+    print(f"📄 {len(pages)} pages, {total_mb:.1f} MB, {args.repeat} runs each\n")
+
+    backends = [name for name in PARSERS if backend_available(name)]
+    totals = {name: 0.0 for name in backends}
+    overlap = {name: [] for name in backends}
+    link_diff = {name: 0 for name in backends}
+
+    for html in pages:
+        _, reference = time_backend(parse_bs4, html, 1)
+        for name in backends:
+            seconds, document = time_backend(PARSERS[name], html, args.repeat)
+            totals[name] += seconds
+            overlap[name].append(line_overlap(document["text"], reference["text"]))
+            link_diff[name] += abs(len(document["links"]) - len(reference["links"]))
+
+    print(f"{'backend':<22}{'ms/page':>10}{'MB/s':>10}{'vs bs4':>10}{'lines':>10}{'link Δ':>10}")
+    for name in backends:
+        per_page = totals[name] / len(pages)
+        print(
+            f"{name:<22}{per_page * 1000:>10.1f}{total_mb / totals[name] if totals[name] else 0:>10.1f}"
+            f"{totals['bs4'] / totals[name] if totals[name] else 0:>9.1f}x"
+            f"{statistics.mean(overlap[name]):>10.1%}{link_diff[name]:>10}"
+        )
+
+    if args.browser:
+        print()
+        for name, seconds in time_browser(pages, args.repeat).items():
+            print(f"{name:<22}{seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
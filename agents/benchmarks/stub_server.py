@@ -0,0 +1,85 @@
+"""Serve recorded fixtures over HTTP so adapters and fetchers can run offline.
+
+    python benchmarks/stub_server.py [root] [--port 8765]
+
+A request for /a/b is answered from <root>/a/b, <root>/a/b.json,
+<root>/a/b.html or <root>/a/b/index.html, whichever exists first. Query
+strings and POST bodies are ignored. ``{{base_url}}`` in a served file is
+replaced with the server's own address, so fixtures can hold absolute links.
+"""
+import argparse
+import mimetypes
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, unquote
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def resolve(root, path):
+    base = os.path.normpath(os.path.join(root, unquote(path).lstrip("/")))
+    if not base.startswith(os.path.normpath(root)):
+        return None
+    for candidate in (base, base + ".json", base + ".html", os.path.join(base, "index.html")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def make_handler(root):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            path = resolve(root, urlparse(self.path).path)
+            if path is None:
+                body, status, content_type = b"not found", 404, "text/plain"
+            else:
+                with open(path, "rb") as f:
+                    body = f.read().replace(b"{{base_url}}", f"http://{self.headers.get('Host')}".encode())
+                status = 200
+                content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                if content_type.startswith("text/"):
+                    content_type += "; charset=utf-8"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = _serve
+        do_POST = _serve
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def start_stub_server(root=FIXTURES_DIR, port=0):
+    """Start the server on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", nargs="?", default=FIXTURES_DIR)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.root))
+    print(f"🧪 Serving {args.root} on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
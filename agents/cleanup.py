@@ -1,11 +1,13 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy import case, func
 from sqlmodel import Session, select, delete
 import datetime
 from typing import Dict
 
 from app.models import Job
 from app.database import engine
+from app.job_stats import get_job_stats
 
 load_dotenv()
 
@@ -18,26 +20,11 @@ class JobCleanupConfig:
     VIEWED_RETENTION = 45
     MIN_MATCH_SCORE_TO_KEEP = 3
     MAX_JOBS_PER_COMPANY = 15
+    DELETE_BATCH_SIZE = 500
 
 
 def get_cleanup_stats(session: Session) -> Dict:
-    stats = {}
-    stats["total_jobs"] = len(session.exec(select(Job)).all())
-
-    statuses = session.exec(select(Job.status).distinct()).all()
-    for status in statuses:
-        count = len(session.exec(select(Job).where(Job.status == status)).all())
-        stats[f'status_{status.lower().replace(" ", "_")}'] = count
-
-    stats["high_match"] = len(
-        session.exec(select(Job).where(Job.match_score >= 8)).all()
-    )
-    stats["medium_match"] = len(
-        session.exec(select(Job).where(Job.match_score.between(5, 7))).all()
-    )
-    stats["low_match"] = len(session.exec(select(Job).where(Job.match_score < 5)).all())
-
-    return stats
+    return get_job_stats(session)
 
 
 def cleanup_by_retention_policy(session: Session) -> Dict[str, int]:
@@ -99,56 +86,63 @@ def cleanup_by_retention_policy(session: Session) -> Dict[str, int]:
     return deleted_counts
 
 
-def cleanup_company_spam(session: Session) -> int:
-    companies = session.exec(select(Job.company).distinct()).all()
+def delete_ranked_in_batches(session: Session, ranked, *conditions) -> int:
     total_deleted = 0
+    while True:
+        doomed_ids = select(ranked.c.id).where(*conditions).limit(JobCleanupConfig.DELETE_BATCH_SIZE)
+        result = session.exec(
+            delete(Job)
+            .where(Job.id.in_(doomed_ids))
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        total_deleted += result.rowcount
+        if result.rowcount < JobCleanupConfig.DELETE_BATCH_SIZE:
+            return total_deleted
 
-    for company in companies:
-        company_jobs = session.exec(
-            select(Job)
-            .where(Job.company == company)
-            .order_by(Job.match_score.desc(), Job.date_found.desc())
-        ).all()
-
-        if len(company_jobs) > JobCleanupConfig.MAX_JOBS_PER_COMPANY:
-            jobs_to_delete = company_jobs[JobCleanupConfig.MAX_JOBS_PER_COMPANY :]
-            for job in jobs_to_delete:
-                if job.status == "New":
-                    session.delete(job)
-                    total_deleted += 1
 
-    session.commit()
-    return total_deleted
+def cleanup_company_spam(session: Session) -> int:
+    ranked = select(
+        Job.id,
+        Job.status,
+        func.row_number()
+        .over(
+            partition_by=Job.company,
+            order_by=(Job.match_score.desc(), Job.date_found.desc(), Job.id.desc()),
+        )
+        .label("company_rank"),
+    ).subquery()
+
+    return delete_ranked_in_batches(
+        session,
+        ranked,
+        ranked.c.company_rank > JobCleanupConfig.MAX_JOBS_PER_COMPANY,
+        ranked.c.status == "New",
+    )
 
 
 def cleanup_duplicate_urls(session: Session) -> int:
-    url_counts = {}
-    all_jobs = session.exec(select(Job)).all()
-
-    for job in all_jobs:
-        if job.url in url_counts:
-            url_counts[job.url].append(job)
-        else:
-            url_counts[job.url] = [job]
-
-    deleted_count = 0
-    for url, jobs in url_counts.items():
-        if len(jobs) > 1:
-            jobs.sort(
-                key=lambda x: (
-                    x.status != "Applied",
-                    x.status != "Interested",
-                    x.date_found,
-                ),
-                reverse=True,
-            )
-
-            for job_to_delete in jobs[1:]:
-                session.delete(job_to_delete)
-                deleted_count += 1
+    status_priority = case(
+        (Job.status == "Applied", 0),
+        (Job.status == "Interested", 1),
+        else_=2,
+    )
+    ranked = select(
+        Job.id,
+        func.row_number()
+        .over(
+            partition_by=Job.url,
+            order_by=(
+                status_priority,
+                Job.match_score.desc().nulls_last(),
+                Job.date_found.desc(),
+                Job.id.desc(),
+            ),
+        )
+        .label("url_rank"),
+    ).subquery()
 
-    session.commit()
-    return deleted_count
+    return delete_ranked_in_batches(session, ranked, ranked.c.url_rank > 1)
 
 
 def run_cleanup():
@@ -1,20 +1,60 @@
-from app.graph import app
+from app.graph import app, create_workflow
 from app.database import create_db_and_tables
+from app.browser_pool import shutdown_browser_pool
+from app.agent_nodes import load_config, load_runtime_resources
+from app.checkpointing import open_checkpointer, new_run_id
+from app.rescoring import rescore_jobs
+from app.config import AgentConfig
+from contextlib import nullcontext
+import argparse
 import time
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the JobBot agent")
+    parser.add_argument("--resume", metavar="RUN_ID", help="continue a checkpointed run from its last completed node")
+    parser.add_argument("--rescore", action="store_true", help="re-analyze stored jobs scored against an older profile, without crawling")
+    parser.add_argument("--rescore-limit", type=int, metavar="N", help="re-score at most N jobs (default RESCORE_MAX_JOBS)")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     start_time = time.time()
 
     create_db_and_tables()
 
+    if args.rescore:
+        rescore_jobs(args.rescore_limit)
+        print(f"⏱️ Total execution time: {time.time() - start_time:.2f} seconds")
+        return
+
     print("🚀 Starting JobBot Agent - Production Mode")
     print("🎯 Target: Entry-level and internship positions in India")
 
-    config = {"recursion_limit": 200, "max_execution_time": 7200}
+    run_id = args.resume or new_run_id()
+    config = {"recursion_limit": 200, "max_execution_time": 7200, "configurable": {"thread_id": run_id}}
 
     try:
-        result = app.invoke({}, config=config)
+        checkpoints = open_checkpointer() if AgentConfig.CHECKPOINT_ENABLED or args.resume else nullcontext()
+        with checkpoints as saver:
+            agent = create_workflow(checkpointer=saver) if saver else app
+
+            if args.resume:
+                snapshot = agent.get_state(config)
+                if not snapshot.values:
+                    print(f"❌ No checkpoint found for run {run_id}")
+                    return
+                if not snapshot.next:
+                    print(f"✅ Run {run_id} already finished")
+                    return
+                print(f"⏯️ Resuming run {run_id} at {', '.join(snapshot.next)}")
+                load_runtime_resources(load_config() or {})
+                result = agent.invoke(None, config=config)
+            else:
+                if saver:
+                    print(f"🧷 Run ID: {run_id} (resume with: python main.py --resume {run_id})")
+                result = agent.invoke({}, config=config)
 
         execution_time = time.time() - start_time
         print(f"\n✅ JobBot execution completed successfully")
@@ -27,6 +67,11 @@ def main():
         execution_time = time.time() - start_time
         print(f"\n❌ JobBot execution failed after {execution_time:.2f} seconds")
         print(f"🔍 Error: {str(e)}")
+        if AgentConfig.CHECKPOINT_ENABLED:
+            print(f"⏯️ Resume with: python main.py --resume {run_id}")
+
+    finally:
+        shutdown_browser_pool()
 
 
 if __name__ == "__main__":
@@ -142,6 +142,7 @@ def populate_user_profile():
             session.commit()
 
             print("✅ Successfully populated the user_profile table.")
+            print("🔁 Refresh existing scores with: python main.py --rescore")
 
         except Exception as e:
             print(f"❌ An error occurred: {e}")
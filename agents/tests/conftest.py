@@ -0,0 +1,23 @@
+import os
+import sys
+
+# AgentConfig and the database engine read the environment at import time, so
+# the suite always runs against an in-memory SQLite database and never touches
+# the database a local .env points at.
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (registers the tables)
+from app.database import engine
+
+
+@pytest.fixture(autouse=True)
+def database():
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
@@ -0,0 +1,84 @@
+import pytest
+
+from app.ats_adapters import ATSAdapter, fetch_ats_postings, make_client
+from benchmarks.stub_server import start_stub_server
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server, base_url = start_stub_server()
+    yield f"{base_url}/ats"
+    server.shutdown()
+
+
+def postings(target):
+    with make_client() as client:
+        return fetch_ats_postings(target, client)
+
+
+def test_base_adapter_is_abstract():
+    with pytest.raises(TypeError):
+        ATSAdapter({"board": "acme", "base_url": "http://localhost"}, None)
+
+
+def test_greenhouse(base_url):
+    jobs = postings({"ats": "greenhouse", "board": "acme", "base_url": f"{base_url}/greenhouse"})
+    assert [job["url"] for job in jobs] == ["https://boards.greenhouse.io/acme/jobs/4001", "https://boards.greenhouse.io/acme/jobs/4002"]
+    first = jobs[0]
+    assert first["title"] == "Software Engineer, New Grad"
+    assert first["location"] == "Bengaluru, India"
+    assert first["date_posted"] == "2026-10-01"
+    # Entity-escaped HTML content comes back as plain text.
+    assert first["description"].startswith("We are looking for a graduate software engineer")
+    assert "<p>" not in first["description"] and "&lt;" not in first["description"]
+
+
+def test_lever(base_url):
+    jobs = postings({"ats": "lever", "board": "acme", "company": "Acme", "base_url": f"{base_url}/lever"})
+    assert len(jobs) == 1
+    job = jobs[0]
+    assert job["url"] == "https://jobs.lever.co/acme/a1b2"
+    assert job["title"] == "Backend Engineer Intern"
+    assert job["location"] == "Hyderabad"
+    assert job["company"] == "Acme"
+    assert job["date_posted"] == "2026-10-01"
+    assert len(job["description"]) >= 100
+
+
+def test_ashby(base_url):
+    jobs = postings({"ats": "ashby", "board": "acme", "base_url": f"{base_url}/ashby"})
+    assert [job["url"] for job in jobs] == ["https://jobs.ashbyhq.com/acme/f00d"]
+    job = jobs[0]
+    assert job["location"] == "Pune; Remote"
+    assert job["salary_range"] == "₹8L – ₹12L"
+    assert job["date_posted"] == "2026-10-05"
+
+
+def test_smartrecruiters_job_urls_follow_the_configured_base(base_url):
+    jobs = postings({"ats": "smartrecruiters", "board": "acme", "base_url": f"{base_url}/smartrecruiters"})
+    assert len(jobs) == 1
+    job = jobs[0]
+    assert job["url"] == f"{base_url}/smartrecruiters/acme/744000001"
+    assert job["company"] == "Acme Corp"
+    assert job["location"] == "Chennai, TN, in"
+    assert job["description"] is None
+
+    jobs = postings({
+        "ats": "smartrecruiters", "board": "acme", "base_url": f"{base_url}/smartrecruiters",
+        "jobs_base_url": "https://careers.acme.com/",
+    })
+    assert jobs[0]["url"] == "https://careers.acme.com/acme/744000001"
+
+
+def test_workday(base_url):
+    jobs = postings({"ats": "workday", "board": "acme/External", "base_url": f"{base_url}/workday"})
+    assert len(jobs) == 1
+    job = jobs[0]
+    assert job["url"] == f"{base_url}/workday/External/job/Bangalore/Graduate-Engineer-Trainee_R1001"
+    assert job["title"] == "Graduate Engineer Trainee"
+    assert job["company"] == "acme"
+
+
+def test_title_filter(base_url):
+    jobs = postings({"ats": "greenhouse", "board": "acme", "base_url": f"{base_url}/greenhouse", "filters": {"title": "new grad"}})
+    assert [job["title"] for job in jobs] == ["Software Engineer, New Grad"]
@@ -0,0 +1,33 @@
+from app.compaction import clean_lines, compact_job_description, is_boilerplate_link
+
+REQUIREMENTS = [
+    "Experience building login and SSO flows",
+    "Familiarity with cookie-based session auth",
+    "Built a sign in page with OAuth",
+    "Register allocation and compiler backends",
+    "Subscribe/publish messaging (Kafka, NATS)",
+    "Knowledge of copyright and licensing for open source",
+]
+
+
+def test_requirement_bullets_mentioning_chrome_words_survive():
+    assert clean_lines("\n".join(REQUIREMENTS)) == REQUIREMENTS
+
+
+def test_whole_line_chrome_is_dropped():
+    chrome = ["Sign in", "Log in", "Accept all cookies", "Subscribe", "Register now", "© 2025 Acme Inc.", "Copyright 2025 Acme", "Skip to main content"]
+    assert clean_lines("\n".join(chrome + ["Python and SQL"])) == ["Python and SQL"]
+
+
+def test_compacted_description_keeps_requirements():
+    text = "\n".join(["Sign in", "Requirements", *REQUIREMENTS, "Accept all cookies"])
+    compacted = compact_job_description(text, 500).text
+    for line in REQUIREMENTS:
+        assert line in compacted
+    assert "Sign in" not in compacted
+    assert "Accept all cookies" not in compacted
+
+
+def test_boilerplate_links_only_match_whole_anchor_text():
+    assert is_boilerplate_link({"url": "https://acme.com/login", "text": "Log in"})
+    assert not is_boilerplate_link({"url": "https://acme.com/jobs/42", "text": "Login and Identity Engineer"})
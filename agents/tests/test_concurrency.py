@@ -0,0 +1,40 @@
+import threading
+
+from app.concurrency import run_pipeline
+
+
+def run_with_timeout(**kwargs):
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(stats=run_pipeline(**kwargs)), daemon=True)
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive(), "run_pipeline hung"
+    return result["stats"]
+
+
+def test_failing_consumer_does_not_hang_the_pipeline():
+    consumed = []
+
+    def consume(item):
+        if item % 3 == 0:
+            raise KeyError("title")
+        consumed.append(item)
+
+    produce_stats, consume_stats = run_with_timeout(
+        items=range(20), produce=lambda item: item, consume=consume, producers=2, consumers=1, queue_size=1,
+    )
+    assert sorted(consumed) == [item for item in range(20) if item % 3]
+    assert produce_stats.items == 20
+    assert consume_stats.items == 20
+
+
+def test_failing_producer_drops_only_its_item():
+    consumed = []
+
+    def produce(item):
+        if item == 5:
+            raise ValueError("boom")
+        return item
+
+    run_with_timeout(items=range(10), produce=produce, consume=consumed.append, producers=2, consumers=2, queue_size=2)
+    assert sorted(consumed) == [0, 1, 2, 3, 4, 6, 7, 8, 9]
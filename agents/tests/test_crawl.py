@@ -0,0 +1,48 @@
+import threading
+
+from app import agent_nodes
+from app.concurrency import HostLimiter
+
+
+def test_host_slot_is_held_through_the_pagination_delay(monkeypatch):
+    events = []
+    lock = threading.Lock()
+
+    def log(kind, state):
+        with lock:
+            events.append((kind, state["current_target"]))
+
+    def navigate(state):
+        log("navigate", state)
+        return state
+
+    def extract(state):
+        state["next_page_url"] = None if state["pages_processed_for_target"] >= 2 else f"{state['current_target']}?page=2"
+        return state
+
+    def prepare(state):
+        log("delay-start", state)
+        agent_nodes.time.sleep(0.05)
+        log("delay-end", state)
+        state["current_page_url"] = state["next_page_url"]
+        state["pages_processed_for_target"] += 1
+        return state
+
+    monkeypatch.setattr(agent_nodes, "navigate_to_page", navigate)
+    monkeypatch.setattr(agent_nodes, "extract_job_urls", extract)
+    monkeypatch.setattr(agent_nodes, "prepare_for_next_page", prepare)
+    monkeypatch.setattr(agent_nodes, "has_more_pages", lambda state: bool(state.get("next_page_url")))
+
+    limiter = HostLimiter(1)
+    targets = ["https://acme.com/careers/a", "https://acme.com/careers/b"]
+    threads = [threading.Thread(target=agent_nodes.crawl_target, args=(target, limiter)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Between a target's delay starting and ending, no other target touches the host.
+    for position, (kind, target) in enumerate(events):
+        if kind == "delay-start":
+            assert events[position + 1] == ("delay-end", target)
+    assert len([event for event in events if event[0] == "navigate"]) == 4
@@ -0,0 +1,60 @@
+from sqlmodel import Session, select
+
+from app import agent_nodes
+from app.config import AgentConfig
+from app.database import engine
+from app.fingerprints import is_unchanged, persisted_fingerprints, save_fingerprints
+from app.models import PageFingerprint
+from app.rate_limiter import RateLimitExceeded
+
+LISTING = "https://acme.com/careers"
+
+
+def target_state(**extra):
+    return {
+        "current_target": LISTING,
+        "current_page_url": LISTING,
+        "pages_processed_for_target": 1,
+        "page_content": "Open roles",
+        "page_links": [{"url": "https://acme.com/about", "text": "About"}],
+        "page_fingerprint": ["abc", 1],
+        "pending_fingerprints": {},
+        **extra,
+    }
+
+
+def test_failed_extraction_drops_the_fingerprint(monkeypatch):
+    def throttled(*args, **kwargs):
+        raise RateLimitExceeded("cooling down")
+
+    monkeypatch.setattr(agent_nodes.llm, "invoke", throttled)
+    monkeypatch.setattr(agent_nodes.time, "sleep", lambda seconds: None)
+    state = agent_nodes.extract_job_urls(target_state())
+    agent_nodes.stage_fingerprint(state)
+    assert state["pending_fingerprints"] == {}
+
+
+def test_fingerprint_waits_for_the_targets_jobs():
+    state = agent_nodes.stage_fingerprint(target_state(current_target_urls=["https://acme.com/jobs/1", "https://acme.com/jobs/2"]))
+    pending = state["pending_fingerprints"]
+    assert pending[LISTING] == ["abc", 1, ["https://acme.com/jobs/1", "https://acme.com/jobs/2"]]
+
+    assert persisted_fingerprints(pending, ["https://acme.com/jobs/2"]) == {}
+    assert save_fingerprints(persisted_fingerprints(pending, [])) == 1
+    assert is_unchanged(LISTING, "abc")
+
+
+def test_skipped_listing_is_recrawled_after_the_max_age(monkeypatch):
+    save_fingerprints({LISTING: ["abc", 1, []]})
+    with Session(engine) as session:
+        first = session.exec(select(PageFingerprint.updated_at)).one()
+
+    # A skip leaves updated_at alone: it marks the last full crawl.
+    state = agent_nodes.stage_fingerprint(target_state(page_unchanged=True, current_target_urls=[]))
+    assert state["pending_fingerprints"] == {}
+    with Session(engine) as session:
+        assert session.exec(select(PageFingerprint.updated_at)).one() == first
+
+    assert is_unchanged(LISTING, "abc")
+    monkeypatch.setattr(AgentConfig, "FINGERPRINT_MAX_AGE_DAYS", 0)
+    assert not is_unchanged(LISTING, "abc")
@@ -0,0 +1,37 @@
+import httpx
+import pytest
+
+from app import ats_adapters, html_text
+from app.http_fetcher import TieredFetcher
+
+PAGE = "<html><head><title>Backend Engineer</title></head><body><nav>Menu</nav><p>" + "Build backend services in Python. " * 40 + "</p></body></html>"
+
+
+@pytest.fixture
+def browser_backend(monkeypatch):
+    monkeypatch.setattr(html_text.AgentConfig, "HTML_TEXT_BACKEND", "browser")
+    html_text.resolve_backend.cache_clear()
+    yield
+    html_text.resolve_backend.cache_clear()
+
+
+def test_raw_html_uses_an_installed_parser_with_the_browser_backend(browser_backend):
+    assert html_text.resolve_backend() == "browser"
+    assert html_text.html_parser() is html_text.PARSERS[html_text.resolve_backend("auto")]
+
+    document = html_text.parse_html(PAGE, "https://acme.com/jobs/1", html_text.DETAIL_DROP_TAGS)
+    assert document["title"] == "Backend Engineer"
+    assert "Menu" not in document["text"]
+    assert "Build backend services" in document["text"]
+
+
+def test_http_fetch_and_ats_descriptions_work_with_the_browser_backend(browser_backend):
+    fetcher = TieredFetcher()
+    fetcher._client = httpx.Client(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text=PAGE, headers={"content-type": "text/html"})
+    ))
+    document, reason = fetcher.fetch("https://acme.com/jobs/1")
+    assert reason is None
+    assert "Build backend services" in document["text"]
+
+    assert ats_adapters.html_to_text("<p>Python and <b>SQL</b></p>").split() == ["Python", "and", "SQL"]
@@ -0,0 +1,63 @@
+import httpx
+import pytest
+
+from app import agent_nodes
+from app.http_fetcher import BROWSER_MODE, GONE, NEEDS_BROWSER, TRANSIENT, TieredFetcher
+
+URL = "https://careers.acme.com/jobs/42"
+FULL_PAGE = "<html><body><h1>Backend Engineer</h1><p>" + "Build backend services in Python. " * 40 + "</p></body></html>"
+JS_SHELL = "<html><body><p>Please enable JavaScript to view this job.</p></body></html>"
+RENDERED = {"title": "Backend Engineer", "company": "Acme", "text": "Build backend services in Python. " * 10, "links": [], "structured_data": []}
+
+
+def fetcher_for(handler):
+    fetcher = TieredFetcher()
+    fetcher._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+def html(status, body):
+    return lambda request: httpx.Response(status, text=body, headers={"content-type": "text/html"})
+
+
+def timeout(request):
+    raise httpx.ConnectTimeout("timed out", request=request)
+
+
+@pytest.mark.parametrize("handler, reason", [
+    (timeout, TRANSIENT),
+    (html(500, "<html>Internal error</html>"), TRANSIENT),
+    (html(429, "<html>Too many requests</html>"), TRANSIENT),
+    (html(403, "<html>Just a moment... checking your browser</html>"), NEEDS_BROWSER),
+    (html(200, JS_SHELL), NEEDS_BROWSER),
+    (html(404, "<html>Not found</html>"), GONE),
+    (html(410, "<html>Gone</html>"), GONE),
+])
+def test_fetch_reports_why_http_gave_up(handler, reason):
+    assert fetcher_for(handler).fetch(URL) == (None, reason)
+
+
+def test_fetch_returns_complete_pages():
+    document, reason = fetcher_for(html(200, FULL_PAGE)).fetch(URL)
+    assert reason is None
+    assert "Build backend services" in document["text"]
+
+
+@pytest.mark.parametrize("handler, flips", [(timeout, False), (html(502, "<html>Bad gateway</html>"), False), (html(200, JS_SHELL), True)])
+def test_only_js_shells_make_the_domain_browser_only(monkeypatch, handler, flips):
+    fetcher = fetcher_for(handler)
+    monkeypatch.setattr(agent_nodes, "http_fetcher", fetcher)
+    monkeypatch.setattr(agent_nodes, "render_job_page", lambda url: dict(RENDERED))
+
+    assert agent_nodes.fetch_job_page(URL)["title"] == "Backend Engineer"
+    assert (fetcher._modes.get("careers.acme.com") == BROWSER_MODE) is flips
+
+
+def test_gone_postings_are_dropped_without_rendering(monkeypatch):
+    monkeypatch.setattr(agent_nodes, "http_fetcher", fetcher_for(html(404, "<html>Not found</html>")))
+
+    def render(url):
+        raise AssertionError("a 404 should not be rendered")
+
+    monkeypatch.setattr(agent_nodes, "render_job_page", render)
+    assert agent_nodes.fetch_job_page(URL) is None
@@ -0,0 +1,27 @@
+from sqlmodel import Session
+
+from app.database import engine
+from app.job_store import JobWriter
+from app.known_urls import known_urls
+from app.models import Job
+
+
+def job(n):
+    return Job(title="Backend Engineer", company="Acme", url=f"https://acme.com/jobs/{n}")
+
+
+def test_saved_jobs_join_the_known_url_index():
+    with Session(engine) as session:
+        session.add(job(1))
+        session.commit()
+    known_urls.load()
+    assert known_urls.size == 1
+    assert "https://acme.com/jobs/2" not in known_urls
+
+    writer = JobWriter(batch_size=10)
+    writer.add(job(1))
+    writer.add(job(2))
+    writer.flush()
+
+    assert "https://acme.com/jobs/2" in known_urls
+    assert known_urls.size == 2
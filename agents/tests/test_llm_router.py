@@ -0,0 +1,31 @@
+from langchain_core.messages import AIMessage
+
+from app.llm import FAST_TIER, LLMRouter
+from app.llm_cache import CachedLLM
+from app.metrics import metrics
+
+
+class PricedModel:
+    model_name = "gpt-4o-mini"
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        return AIMessage(content='{"ok": true}', usage_metadata={"input_tokens": 1000, "output_tokens": 100, "total_tokens": 1100})
+
+
+def test_cache_hits_are_not_counted_as_provider_calls():
+    model = PricedModel()
+    router = LLMRouter({FAST_TIER: [("openai:gpt-4o-mini", CachedLLM(model, ttl_hours=1, max_entries=100))]})
+    metrics.reset()
+
+    for _ in range(3):
+        assert router.invoke("Extract jobs", prompt_version="test-v1").content == '{"ok": true}'
+
+    assert model.calls == 1
+    assert metrics.counters["llm_fast_calls"] == 1
+    assert metrics.counters["llm_fast_cache_hits"] == 2
+    assert metrics.counters["llm_fast_tokens"] == 1100
+    assert round(metrics.counters["llm_fast_cost_usd"], 6) == round((1000 * 0.15 + 100 * 0.60) / 1_000_000, 6)
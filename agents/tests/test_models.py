@@ -0,0 +1,26 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models import JobFitAnalysis
+
+
+@pytest.mark.parametrize("score, expected", [(7.5, 8), ("6", 6), ("9/10", 9), (0, 1), (14, 10)])
+def test_match_score_is_rounded_and_clamped(score, expected):
+    assert JobFitAnalysis(match_score=score, match_summary="ok").match_score == expected
+
+
+def test_company_info_values_are_stringified():
+    analysis = JobFitAnalysis(match_score=5, match_summary="ok", company_info={"employees": 500, "public": True, "hq": None})
+    assert analysis.company_info == {"employees": "500", "public": "True"}
+
+
+def test_loose_skill_lists_are_accepted():
+    analysis = JobFitAnalysis(match_score=5, matching_skills="Python, SQL", missing_skills=None)
+    assert analysis.matching_skills == ["Python", "SQL"]
+    assert analysis.missing_skills == []
+    assert analysis.match_summary == "Analysis completed"
+
+
+def test_unreadable_score_is_still_rejected():
+    with pytest.raises(ValidationError):
+        JobFitAnalysis(match_score="high", match_summary="ok")
@@ -0,0 +1,83 @@
+import json
+
+from langchain_core.messages import AIMessage
+from sqlmodel import Session
+
+from app import agent_nodes
+from app.database import engine
+from app.models import Job, UserProfile
+from app.rescoring import rescore_jobs
+
+PROFILE = {
+    "full_name": "Test Candidate",
+    "summary": "Backend developer",
+    "experience": "Software engineering intern, Jun 2025 - Dec 2025",
+    "skills": "Python, SQL, Docker",
+}
+DESCRIPTION = "Build backend services in Python and SQL for our platform. " * 5
+
+
+class AnalysisLLM:
+    """Answers every scoring prompt with an analysis that has no company_info or missing_skills."""
+
+    def invoke(self, prompt, **kwargs):
+        return AIMessage(content=json.dumps({"match_score": 8, "match_summary": "New analysis", "matching_skills": ["Python", "SQL"]}))
+
+    def has_tier(self, tier):
+        return False
+
+    def forget(self, *args, **kwargs):
+        pass
+
+
+def stored_row(key, title="Backend Engineer"):
+    return Job(
+        title=title,
+        company="Acme",
+        url=f"https://acme.com/jobs/{key}",
+        raw_description=DESCRIPTION,
+        match_score=5,
+        match_summary="Old analysis",
+        matching_skills=json.dumps(["Python"]),
+        missing_skills=json.dumps(["Go"]),
+        company_info=json.dumps({"industry": "Tech", "date_posted": "2025-01-02"}),
+        profile_version="old",
+    )
+
+
+def test_rescore_keeps_fields_the_new_analysis_leaves_out(monkeypatch):
+    monkeypatch.setattr(agent_nodes, "llm", AnalysisLLM())
+    monkeypatch.setattr(agent_nodes.AgentConfig, "SCORING_BATCH_SIZE", 1)
+    with Session(engine) as session:
+        session.add(UserProfile(**PROFILE))
+        session.add(stored_row("backend"))
+        # Senior titles are capped by the pre-scorer, which reports no missing skills.
+        session.add(stored_row("principal", title="Principal Architect"))
+        session.commit()
+
+    result = rescore_jobs()
+    assert result["rescored"] == 2
+    assert result["prefiltered"] == 1
+
+    with Session(engine) as session:
+        for job_id in (1, 2):
+            row = session.get(Job, job_id)
+            assert row.profile_version == result["profile_version"]
+            assert json.loads(row.company_info) == {"industry": "Tech", "date_posted": "2025-01-02"}
+            assert json.loads(row.missing_skills) == ["Go"]
+        assert session.get(Job, 1).match_summary == "New analysis"
+        assert session.get(Job, 2).match_summary.startswith("Prefiltered")
+
+
+def test_stale_jobs_outside_the_active_statuses_are_rescored_last():
+    from app.rescoring import find_stale_jobs
+
+    with Session(engine) as session:
+        for key, status in [("viewed", "Viewed"), ("new", "New"), ("applied", "Applied")]:
+            row = stored_row(key)
+            row.status = status
+            session.add(row)
+        session.commit()
+
+        assert [job.status for job in find_stale_jobs(session, "current", 10)] == ["Applied", "New", "Viewed"]
+        assert [job.status for job in find_stale_jobs(session, "current", 2)] == ["Applied", "New"]
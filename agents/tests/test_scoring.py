@@ -0,0 +1,97 @@
+import json
+
+from langchain_core.messages import AIMessage
+
+from app import agent_nodes
+from app.rate_limiter import RateLimitExceeded
+
+PROFILE = {"summary": "Backend developer", "skills": "Python, SQL"}
+DESCRIPTION = "Build backend services in Python and SQL for our platform. " * 5
+
+
+class ReplyLLM:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        return AIMessage(content=json.dumps(self.content))
+
+    def forget(self, *args, **kwargs):
+        pass
+
+
+def fetched(n):
+    return {"url": f"https://acme.com/jobs/{n}", "title": "Backend Engineer", "company": "Acme", "description": DESCRIPTION}
+
+
+def test_batch_and_single_paths_coerce_the_same_way(monkeypatch):
+    analysis = {"match_score": 7.6, "match_summary": "Good fit", "company_info": {"employees": 500}}
+    batch_llm = ReplyLLM({"results": [{"job_id": "job-1", **analysis}, {"job_id": "job-2", **analysis}]})
+    monkeypatch.setattr(agent_nodes, "llm", batch_llm)
+    jobs = agent_nodes.score_job_batch(PROFILE, [fetched(1), fetched(2)])
+    assert sorted(jobs) == [1, 2]
+    assert batch_llm.calls == 1
+
+    monkeypatch.setattr(agent_nodes, "llm", ReplyLLM(analysis))
+    single = agent_nodes.score_job(PROFILE, fetched(3))
+    for job in [*jobs.values(), single]:
+        assert job.match_score == 8
+        assert json.loads(job.company_info) == {"employees": "500"}
+        assert job.match_summary == "Good fit"
+
+
+def test_score_stage_times_the_batched_llm_calls(monkeypatch):
+    class SlowBatchLLM(ReplyLLM):
+        def invoke(self, prompt, **kwargs):
+            agent_nodes.time.sleep(0.05)
+            return super().invoke(prompt, **kwargs)
+
+    analysis = {"match_score": 6, "match_summary": "Fair fit"}
+    monkeypatch.setattr(agent_nodes, "llm", SlowBatchLLM({"results": [{"job_id": f"job-{n}", **analysis} for n in (1, 2, 3)]}))
+    monkeypatch.setattr(agent_nodes.AgentConfig, "SCORING_BATCH_SIZE", 4)
+    monkeypatch.setattr(agent_nodes.AgentConfig, "PRESCORE_ENABLED", False)
+    monkeypatch.setattr(agent_nodes.AgentConfig, "LLM_ESCALATION_ENABLED", False)
+
+    stored = []
+    _, _, _, score_stats, _ = agent_nodes.analyze_jobs(
+        PROFILE, [(n, fetched(n)) for n in range(3)], lambda item: item, lambda index, job: stored.append(index), loaders=1,
+    )
+
+    assert sorted(stored) == [0, 1, 2]
+    assert score_stats.items == 3
+    assert score_stats.busy_seconds >= 0.05
+
+
+def test_unscored_jobs_are_reported_as_failed(monkeypatch):
+    class BrokenLLM(ReplyLLM):
+        def invoke(self, prompt, **kwargs):
+            if "job-2" in prompt or "Throttled" in prompt:
+                raise RateLimitExceeded("cooling down")
+            raise ValueError("provider error")
+
+    monkeypatch.setattr(agent_nodes, "llm", BrokenLLM({}))
+    monkeypatch.setattr(agent_nodes.AgentConfig, "SCORING_BATCH_SIZE", 1)
+    monkeypatch.setattr(agent_nodes.AgentConfig, "PRESCORE_ENABLED", False)
+    monkeypatch.setattr(agent_nodes.AgentConfig, "ANALYSIS_REQUEUE_ROUNDS", 1)
+
+    throttled = {**fetched(2), "description": "Throttled " + DESCRIPTION}
+    stored = []
+    *_, failed_urls = agent_nodes.analyze_jobs(
+        PROFILE, [(1, fetched(1)), (2, throttled)], lambda item: item, lambda index, job: stored.append(index), loaders=1,
+    )
+
+    assert stored == []
+    assert sorted(failed_urls) == ["https://acme.com/jobs/1", "https://acme.com/jobs/2"]
+
+
+def test_ats_posting_without_a_title_is_still_scored(monkeypatch):
+    monkeypatch.setattr(agent_nodes.AgentConfig, "PRESCORE_THRESHOLD", 11)
+    untitled = {key: value for key, value in fetched(1).items() if key != "title"}
+    stored = []
+    *_, failed_urls = agent_nodes.analyze_jobs(
+        PROFILE, [(0, untitled)], lambda item: item, lambda index, job: stored.append(job), loaders=1,
+    )
+    assert failed_urls == []
+    assert stored[0].title == "Unknown Position"
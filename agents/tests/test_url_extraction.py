@@ -0,0 +1,39 @@
+import json
+
+from langchain_core.messages import AIMessage
+
+from app import agent_nodes
+from app.rate_limiter import RateLimitExceeded
+
+LISTING = "https://acme.com/careers"
+
+
+class ThrottledOnceLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise RateLimitExceeded("cooling down", retry_after=7)
+        return AIMessage(content=json.dumps({"job_urls": ["https://acme.com/jobs/1"], "next_page_url": f"{LISTING}?page=2"}))
+
+
+def test_throttled_extraction_is_retried_after_the_backoff(monkeypatch):
+    sleeps = []
+    fake_llm = ThrottledOnceLLM()
+    monkeypatch.setattr(agent_nodes, "llm", fake_llm)
+    monkeypatch.setattr(agent_nodes.time, "sleep", sleeps.append)
+
+    state = agent_nodes.extract_job_urls({
+        "current_target": LISTING,
+        "current_page_url": LISTING,
+        "pages_processed_for_target": 1,
+        "page_content": "Open roles",
+        "page_links": [{"url": "https://acme.com/about", "text": "About"}],
+    })
+
+    assert fake_llm.calls == 2
+    assert sleeps == [7]
+    assert state["current_target_urls"] == ["https://acme.com/jobs/1"]
+    assert state["next_page_url"] == f"{LISTING}?page=2"